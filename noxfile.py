@@ -3,5 +3,5 @@ from nox_poetry import session
 
 @session(python=["3.10", "3.9", "3.8"])
 def tests(session):
-    session.install("pytest", ".")
-    session.run("pytest")
+    session.install("pytest", "pytest-xdist", "cloudpickle", ".")
+    session.run("pytest", "-n", "auto", "--dist", "loadfile")
@@ -26,6 +26,7 @@ from .nodes import (
     Node,
     SetVar,
     Step,
+    StepGraph,
     Switch,
     TryExcept,
     TryUntil,
@@ -103,9 +104,25 @@ class Workflow(Nodes):
         :param nodes_: Nodes to append to the current block
         :return: Returns self; fluent interface
         """
-        self._nodes.extend(nodes_)
+        for node in nodes_:
+            self._append_node(node)
         return self
 
+    def _append_node(self, node: Node):
+        """Append a node to the node list.
+
+        Consecutive ``SetVar`` nodes that set different variables are fused
+        into a single node; values are still set in the order supplied.
+        """
+        nodes_ = self._nodes
+        if type(node) is SetVar and nodes_ and type(nodes_[-1]) is SetVar:
+            previous = nodes_[-1]
+            if not previous.values.keys() & node.values.keys():
+                nodes_[-1] = SetVar(**previous.values, **node.values)
+                return
+
+        nodes_.append(node)
+
     def nested(self, *nodes_: Node) -> Self:
         """Add nested node(s), nested nodes have their own scope.
 
@@ -123,7 +140,7 @@ class Workflow(Nodes):
         :return: Returns self; fluent interface
 
         """
-        self._nodes.append(SetVar(**kwargs))
+        self._append_node(SetVar(**kwargs))
         return self
 
     def default_vars(self, **kwargs) -> Self:
@@ -2,8 +2,10 @@ from __future__ import annotations
 
 import abc
 import logging
+import string
 from collections import deque
 from typing import (
+    Callable,
     Dict,
     Any,
     Type,
@@ -27,6 +29,8 @@ class Navigable(abc.ABC):
 
     Used to map out the workflow tree."""
 
+    __slots__ = ()
+
     @property
     @abc.abstractmethod
     def name(self) -> str:
@@ -117,6 +121,12 @@ class TraceScope(List[Tuple[Navigable, Dict[str, Any]]]):
         )
 
 
+class BoundedTraceScope(deque):
+    """Trace scope that only keeps the most recently visited objects."""
+
+    __rich__ = TraceScope.__rich__
+
+
 class FlowTrace(List[State]):
     """Trace of the visited workflow tree."""
 
@@ -158,6 +168,8 @@ class WorkflowContext(StateContext):
 
     :param logger: And optional logger; one will be created named `pyapp_flow`
         if not provided.
+    :param trace_limit: Optional maximum number of nodes kept in the trace of
+        each scope (at least 1); by default all nodes are kept.
     :param variables: Initial state of variables.
 
     .. code-block:: python
@@ -172,7 +184,7 @@ class WorkflowContext(StateContext):
 
     """
 
-    __slots__ = ("logger", "_flow_trace", "_extra_indent")
+    __slots__ = ("logger", "_flow_trace", "_extra_indent", "_trace_limit")
 
     class BlockIndentContext:
         """Context manager to increase the indent level."""
@@ -188,8 +200,13 @@ class WorkflowContext(StateContext):
         def __exit__(self, exc_type, exc_val, exc_tb):
             self._context._extra_indent -= 1
 
-    def __init__(self, logger: logging.Logger = None, **variables):
-        variables[TRACE_STATE_KEY] = TraceScope()
+    def __init__(
+        self, logger: logging.Logger = None, *, trace_limit: int = None, **variables
+    ):
+        if trace_limit is not None and trace_limit < 1:
+            raise ValueError("Trace limit must be at least 1")
+        self._trace_limit = trace_limit
+        variables[TRACE_STATE_KEY] = self._new_trace_scope()
         super().__init__(variables)
 
         self.logger = logger or logging.getLogger("pyapp_flow")
@@ -205,6 +222,23 @@ class WorkflowContext(StateContext):
         """Return a context manager to increase the indent level."""
         return self.BlockIndentContext(self)
 
+    def branch(self) -> "WorkflowContext":
+        """Create a branch of this context with a new state scope.
+
+        The branch is an independent context so it can be used from another
+        thread; modifications to the branch state do not affect this context.
+        Outer scopes are shared so values should only be read.
+        """
+        branch = WorkflowContext.__new__(WorkflowContext)
+        branch.state = self.state
+        branch._state_vector = deque(self._state_vector)
+        branch.logger = self.logger
+        branch._flow_trace = None
+        branch._extra_indent = self._extra_indent
+        branch._trace_limit = self._trace_limit
+        branch.push_state()
+        return branch
+
     # Tracing #################################################################
 
     @property
@@ -222,12 +256,27 @@ class WorkflowContext(StateContext):
             for scope in self._state_vector:
                 trace.append(scope.copy())
 
+    def merge_trace(self, branch: "WorkflowContext"):
+        """Take the flow trace captured by a branch of this context.
+
+        Used when an error raised in a branch is re-raised from this context,
+        the branch trace includes the outer scopes of this context.
+        """
+        if branch._flow_trace:
+            self._flow_trace = branch._flow_trace
+
     def push_state(self):
         """Push a new state onto the stack."""
         super().push_state()
 
         # Add a trace entry
-        self.state[TRACE_STATE_KEY] = TraceScope()
+        self.state[TRACE_STATE_KEY] = self._new_trace_scope()
+
+    def _new_trace_scope(self) -> Union[TraceScope, BoundedTraceScope]:
+        """Create a trace scope, bounded if a trace limit is set."""
+        if self._trace_limit is None:
+            return TraceScope()
+        return BoundedTraceScope(maxlen=self._trace_limit)
 
     def trace(self, node: Navigable):
         """Add a node to the trace."""
@@ -243,7 +292,10 @@ class WorkflowContext(StateContext):
 
     def log(self, level: int, msg: str, *args, **kwargs):
         """Log a message to logger indented by the current scope depth."""
-        self.logger.log(level, f"{self.indent}{msg}", *args, **kwargs)
+        logger = self.logger
+        # Check the level first to avoid building the indented message
+        if logger.isEnabledFor(level):
+            logger.log(level, f"{self.indent}{msg}", *args, **kwargs)
 
     def debug(self, msg, *args):
         """Write a debug message to log."""
@@ -272,7 +324,7 @@ class WorkflowContext(StateContext):
         variables. The substitutions are identified by braces ('{' and '}').
         """
         try:
-            return message.format(**self.state)
+            return message.format_map(self.state)
         except Exception as ex:
             self.log(
                 logging.WARNING,
@@ -284,6 +336,90 @@ class WorkflowContext(StateContext):
             return message
 
 
+def _compile_template(
+    parts: Sequence[Tuple[str, Optional[str], Optional[str], Optional[str]]]
+) -> Optional[Callable[[State], str]]:
+    """Compile parsed message parts into an f-string function of the state.
+
+    Only fields that are plain variable names (with an optional conversion and
+    constant format spec) are supported; otherwise ``None`` is returned.
+    Literals, keys and format specs are bound as argument defaults so the
+    generated source only contains generated names.
+    """
+    names = {}
+    pieces = []
+    for idx, (literal, field, format_spec, conversion) in enumerate(parts):
+        if literal:
+            names[f"_l{idx}"] = literal
+            pieces.append(f"{{_l{idx}}}")
+        if field is None:
+            continue
+        if (
+            not field.isidentifier()
+            or "{" in format_spec
+            or conversion not in (None, "r", "s", "a")
+        ):
+            return None
+
+        names[f"_k{idx}"] = field
+        replacement = f"s[_k{idx}]"
+        if conversion:
+            replacement += f"!{conversion}"
+        if format_spec:
+            names[f"_f{idx}"] = format_spec
+            replacement += f":{{_f{idx}}}"
+        pieces.append(f"{{{replacement}}}")
+
+    args = "".join(f", {name}={name}" for name in names)
+    return eval(f'lambda s{args}: f"{"".join(pieces)}"', {}, names)
+
+
+class MessageTemplate:
+    """Message that is parsed once so it can be formatted repeatedly.
+
+    A message without any substitutions is resolved up front and returned
+    without being formatted. A message that only substitutes variable names is
+    compiled into an f-string, otherwise (or if rendering fails) the message
+    is formatted using :func:`WorkflowContext.format`.
+    """
+
+    __slots__ = ("message", "_constant", "_render")
+
+    def __init__(self, message: str):
+        self.message = message
+        self._constant = None
+        self._render = None
+
+        try:
+            parts = list(string.Formatter().parse(message))
+        except ValueError:
+            # Malformed message; formatting will report the error
+            return
+
+        if all(field is None for _, field, _, _ in parts):
+            self._constant = "".join(literal for literal, _, _, _ in parts)
+        else:
+            self._render = _compile_template(parts)
+
+    def __reduce__(self):
+        # The compiled renderer cannot be pickled; compile again when loaded
+        return MessageTemplate, (self.message,)
+
+    def format(self, context: "WorkflowContext") -> str:
+        """Format the message using context variables."""
+        if self._constant is not None:
+            return self._constant
+
+        if self._render is not None:
+            try:
+                return self._render(context.state)
+            except Exception:
+                # Fall back so the error is reported by the context
+                pass
+
+        return context.format(self.message)
+
+
 class DescribeContext(StateContext):
     """Context used to describe/verify a workflow."""
 
@@ -1,4 +1,7 @@
-from typing import Callable, Mapping, Tuple, Sequence, Union, Iterable, Any
+import inspect
+from functools import lru_cache
+from graphlib import TopologicalSorter
+from typing import Callable, Mapping, Tuple, Sequence, Union, Iterable, Any, List
 
 from .datastructures import WorkflowContext
 from .errors import (
@@ -25,8 +28,37 @@ def var_list(var_names: Union[str, Sequence[str]]) -> Sequence[str]:
     return [name.strip() for name in var_names]
 
 
+def introspect_function(func: Callable) -> Tuple[Callable, int]:
+    """Resolve the function to introspect and the number of bound arguments.
+
+    Callable objects are introspected using their ``__call__`` method; bound
+    methods are resolved to the underlying function and the ``self`` argument
+    is skipped.
+    """
+    if not hasattr(func, "__code__"):
+        func = func.__call__
+    if inspect.ismethod(func):
+        return func.__func__, 1
+    return func, 0
+
+
+# Bound the introspection caches; steps built from lambdas or closures would
+# otherwise keep every function object alive for the life of the process.
+SIGNATURE_CACHE_SIZE = 4096
+
+
 def extract_inputs(func: Callable) -> Tuple[Mapping[str, type], str]:
-    """Extract input variables from function."""
+    """Extract input variables from function.
+
+    Results are cached for each underlying function, so callable objects and
+    bound methods do not need to be hashable and are not kept alive by the
+    cache; the returned mapping is shared so must not be modified.
+    """
+    return _extract_inputs(*introspect_function(func))
+
+
+@lru_cache(maxsize=SIGNATURE_CACHE_SIZE)
+def _extract_inputs(func: Callable, bound_args: int) -> Tuple[Mapping[str, type], str]:
     func_code = func.__code__
     annotations = func.__annotations__
 
@@ -43,7 +75,7 @@ def extract_inputs(func: Callable) -> Tuple[Mapping[str, type], str]:
         getattr(func_code, name, 0)
         for name in ("co_argcount", "co_posonlyargcount", "co_kwonlyargcount")
     )
-    for name in func_code.co_varnames[:total_args]:
+    for name in func_code.co_varnames[bound_args:total_args]:
         type_ = annotations.get(name)
         # Extract a context instance
         if type_ is WorkflowContext:
@@ -63,7 +95,20 @@ def extract_inputs(func: Callable) -> Tuple[Mapping[str, type], str]:
 def extract_outputs(
     func: Callable, names: Union[str, Sequence[str]]
 ) -> Sequence[Tuple[str, type]]:
-    """Extract outputs from function."""
+    """Extract outputs from function.
+
+    Results are cached for each underlying function and names.
+    """
+    # Ensure names is hashable for the cache
+    if names is not None and not isinstance(names, str):
+        names = tuple(names)
+    return _extract_outputs(introspect_function(func)[0], names)
+
+
+@lru_cache(maxsize=SIGNATURE_CACHE_SIZE)
+def _extract_outputs(
+    func: Callable, names: Union[str, Tuple[str, ...], None]
+) -> Sequence[Tuple[str, type]]:
     types = func.__annotations__.get("return")
 
     # Ensure names is a list
@@ -127,6 +172,48 @@ def merge_nested_entries(
     return results
 
 
+def dependency_levels(steps: Sequence[Any]) -> List[Tuple[Any, ...]]:
+    """Group steps into levels of steps that do not depend on each other.
+
+    A step depends on an earlier step if it reads a variable the earlier step
+    writes or writes a variable the earlier step reads or writes. Steps with
+    access to the workflow context depend on, and are depended on by, every
+    other step. Levels are returned in dependency order, steps within a level
+    are in the order supplied.
+
+    >>> dependency_levels([load_a, load_b, combine_a_b])
+    ... [(load_a, load_b), (combine_a_b,)]
+
+    """
+    access = [
+        (set(step.inputs), {name for name, _ in step.outputs}, bool(step.context_var))
+        for step in steps
+    ]
+
+    sorter = TopologicalSorter()
+    for idx, (reads, writes, uses_context) in enumerate(access):
+        sorter.add(idx)
+        for prev_idx, (prev_reads, prev_writes, prev_uses_context) in enumerate(
+            access[:idx]
+        ):
+            if (
+                uses_context
+                or prev_uses_context
+                or reads & prev_writes
+                or writes & (prev_reads | prev_writes)
+            ):
+                sorter.add(idx, prev_idx)
+
+    levels = []
+    sorter.prepare()
+    while sorter.is_active():
+        level = sorted(sorter.get_ready())
+        levels.append(tuple(steps[idx] for idx in level))
+        sorter.done(*level)
+
+    return levels
+
+
 def required_variables_in_context(
     node_name: str,
     required_vars: Sequence[Tuple[str, type]],
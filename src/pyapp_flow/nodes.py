@@ -1,4 +1,7 @@
 import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
+from operator import itemgetter
 from typing import (
     Callable,
     Sequence,
@@ -9,18 +12,68 @@ from typing import (
     Optional,
     Any,
     Dict,
+    List,
+    Tuple,
 )
 from typing_extensions import Self
 
 from pyapp import feature_flags
 
-from .datastructures import WorkflowContext, Navigable, Branches
-from .errors import FatalError, WorkflowRuntimeError, SkipStep, StepFailedError
-from .functions import extract_inputs, extract_outputs, call_nodes, var_list, call_node
+from .datastructures import (
+    WorkflowContext,
+    Navigable,
+    Branches,
+    MessageTemplate,
+    State,
+)
+from .errors import (
+    FatalError,
+    WorkflowRuntimeError,
+    WorkflowSetupError,
+    SkipStep,
+    StepFailedError,
+)
+from .functions import (
+    extract_inputs,
+    extract_outputs,
+    call_nodes,
+    var_list,
+    call_node,
+    dependency_levels,
+    introspect_function,
+)
 from .helpers import change_log_level
 
 Node = Callable[[WorkflowContext], Any]
 
+# Maximum number of results cached by a step; least recently used are dropped
+STEP_CACHE_SIZE = 1024
+
+
+class _SingleItemGetter:
+    """Getter that returns a single value from the state as a tuple.
+
+    A class rather than a closure so steps remain picklable.
+    """
+
+    __slots__ = ("name",)
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __call__(self, state: State) -> Tuple[Any]:
+        return (state[self.name],)
+
+
+def _exception_tuple(
+    except_types: Union[Type[Exception], Sequence[Type[Exception]], None],
+    default: Type[Exception] = Exception,
+) -> Tuple[Type[Exception], ...]:
+    """Normalise exception type(s) into a tuple usable in an except clause."""
+    if isinstance(except_types, type):
+        return (except_types,)
+    return tuple(except_types or ()) or (default,)
+
 
 class Step(Navigable):
     """
@@ -44,10 +97,17 @@ class Step(Navigable):
     >>> def my_step(context: WorkflowContext):
     >>>     pass
 
-    :param func: Callable function or lambda
+    :param func: Callable function, lambda or callable object
     :param name: Optional name of the step (defaults to the name of the function)
     :param output: A sequence of ``str`` or ``Tuple[str, type]`` defining the
         output(s) of the step function.
+    :param cache: Cache results of the step function by input values; the
+        function must be pure (results depend only on the inputs). The most
+        recently used ``STEP_CACHE_SIZE`` results are kept. Input values are
+        compared by equality and type, so ``1``, ``1.0`` and ``True`` are
+        cached separately, values nested in a container are compared by
+        equality only (eg ``(1,)`` and ``(1.0,)`` share a result). Calls with
+        unhashable input values are not cached.
     """
 
     __slots__ = (
@@ -57,6 +117,13 @@ class Step(Navigable):
         "_name",
         "ignore_exceptions",
         "context_var",
+        "_output_names",
+        "_store_results",
+        "_name_template",
+        "_call",
+        "_cache",
+        "_input_names",
+        "_input_getter",
     )
 
     def __init__(
@@ -65,26 +132,80 @@ class Step(Navigable):
         name: str = None,
         output: Union[str, Sequence[str]] = None,
         ignore_exceptions: Union[Type[Exception], Sequence[Type[Exception]]] = None,
+        *,
+        cache: bool = False,
     ):
         self.func = func
-        self._name = name or func.__name__.replace("_", " ").title()
-        self.ignore_exceptions = ignore_exceptions
+        func_name = getattr(func, "__name__", type(func).__name__)
+        self._name = name or func_name.replace("_", " ").title()
+        self._name_template = MessageTemplate(self._name)
+        if ignore_exceptions is None:
+            self.ignore_exceptions = ()
+        elif isinstance(ignore_exceptions, type):
+            self.ignore_exceptions = (ignore_exceptions,)
+        else:
+            self.ignore_exceptions = tuple(ignore_exceptions)
 
         self.inputs, self.context_var = extract_inputs(func)
+        self._input_names = tuple(self.inputs)
         self.outputs = extract_outputs(func, output)
+        self._output_names = tuple(name for name, _ in self.outputs)
+        if cache:
+            if self.context_var:
+                raise WorkflowSetupError(
+                    f"Step {self._name} has access to the workflow context "
+                    "and cannot be cached"
+                )
+            self._cache = self._new_cache()
+            self._call = self._call_cached
+        else:
+            self._cache = None
+            self._call = self.func
+
+        # Steps with only positional inputs are called with values fetched by
+        # a single getter rather than building a dict of keyword arguments
+        names = self._input_names
+        kwonly_args = introspect_function(func)[0].__code__.co_kwonlyargcount
+        if names and not (self.context_var or kwonly_args):
+            self._input_getter = (
+                itemgetter(*names) if len(names) > 1 else _SingleItemGetter(names[0])
+            )
+        else:
+            self._input_getter = None
+
+        # Select how results are stored once rather than on every call
+        if not self.outputs:
+            self._store_results = self._store_no_results
+        elif len(self.outputs) == 1:
+            self._store_results = self._store_single_result
+        else:
+            self._store_results = self._store_multiple_results
 
     def __call__(self, context: WorkflowContext) -> Any:
         """Call the step function."""
         state = context.state
 
         # Prepare args from context
-        kwargs = {name: state[name] for name in self.inputs if name in state}
-        if self.context_var:
-            kwargs[self.context_var] = context
+        args = None
+        if self._input_getter is not None:
+            try:
+                args = self._input_getter(state)
+            except KeyError:
+                # Pass the available values by name so defaults are applied
+                pass
+
+        if args is None:
+            args = ()
+            kwargs = {name: state[name] for name in self._input_names if name in state}
+            if self.context_var:
+                kwargs[self.context_var] = context
+        else:
+            kwargs = {}
 
-        context.info("🔹Step `%s`", context.format(self.name))
+        if context.logger.isEnabledFor(logging.INFO):
+            context.info("🔹Step `%s`", self._name_template.format(context))
         try:
-            results = self.func(**kwargs)
+            results = self._call(*args, **kwargs)
 
         except SkipStep as ex:
             context.warning(" 🔃 Skipping step: %s", ex)
@@ -94,21 +215,57 @@ class Step(Navigable):
             raise
 
         except Exception as ex:
-            if self.ignore_exceptions and isinstance(ex, self.ignore_exceptions):
+            if isinstance(ex, self.ignore_exceptions):
                 context.warning("  ❌ Ignoring exception: %s", ex)
             else:
                 context.error("  ⛔ Exception raised: %s", ex)
                 raise
 
         else:
-            if self.outputs:
-                # Helper so a simple return can be used for a single result
-                values = (results,) if len(self.outputs) == 1 else results
-                for name, value in zip((output[0] for output in self.outputs), values):
-                    context.state[name] = value
-
+            self._store_results(context.state, results)
             return results
 
+    def __getstate__(self) -> Dict[str, Any]:
+        state = {
+            name: getattr(self, name)
+            for cls in type(self).__mro__
+            for name in getattr(cls, "__slots__", ())
+        }
+        # The result cache cannot be pickled; an empty cache is created on load
+        state["_cache"] = self._cache is not None
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]):
+        cache = state.pop("_cache")
+        for name, value in state.items():
+            setattr(self, name, value)
+        self._cache = self._new_cache() if cache else None
+
+    def _new_cache(self) -> Callable:
+        """Create a cache of the most recently used step results."""
+        return lru_cache(maxsize=STEP_CACHE_SIZE, typed=True)(self.func)
+
+    def _call_cached(self, *args, **kwargs) -> Any:
+        """Call the step function returning cached results for known inputs."""
+        try:
+            hash((args, *kwargs.values()))
+        except TypeError:
+            # Unhashable input values
+            return self.func(*args, **kwargs)
+        return self._cache(*args, **kwargs)
+
+    def _store_no_results(self, state: State, results: Any):
+        """Step has no outputs; results are not stored."""
+
+    def _store_single_result(self, state: State, result: Any):
+        """Store the result of a step with a single output."""
+        state[self._output_names[0]] = result
+
+    def _store_multiple_results(self, state: State, results: Sequence[Any]):
+        """Store the results of a step with multiple outputs."""
+        for name, value in zip(self._output_names, results):
+            state[name] = value
+
     @property
     def name(self) -> str:
         """Name of the node."""
@@ -121,11 +278,12 @@ def step(
     name: str = None,
     output: Union[str, Sequence[str]] = None,
     ignore_exceptions: Union[Type[Exception], Sequence[Type[Exception]]] = None,
+    cache: bool = False,
 ) -> Union[Callable[[Callable], Step], Step]:
     """Decorate a method turning it into a step"""
 
     def decorator(func_) -> Step:
-        return Step(func_, name, output, ignore_exceptions)
+        return Step(func_, name, output, ignore_exceptions, cache=cache)
 
     return decorator(func) if func else decorator
 
@@ -191,6 +349,64 @@ class Group(Navigable):
                     call_nodes(context, self._finally_nodes)
 
 
+class StepGraph(Navigable):
+    """Group of steps called in dependency order.
+
+    Dependencies are determined from the variables each step reads and writes;
+    steps that do not depend on each other are called concurrently in a thread
+    pool. Steps with access to the workflow context are always called on their
+    own. Steps should not modify their input values in place.
+
+    :param steps: Steps (or functions) to call.
+    :param max_workers: Maximum number of threads used to call steps.
+
+    .. code-block:: python
+
+        # Both fetch steps are called concurrently before the report is built
+        StepGraph(fetch_orders, fetch_customers, build_report)
+
+    """
+
+    __slots__ = ("_nodes", "_levels", "_max_workers")
+
+    def __init__(self, *steps: Union[Step, Callable], max_workers: int = None):
+        self._nodes = tuple(
+            node if isinstance(node, Step) else Step(node) for node in steps
+        )
+        self._levels = dependency_levels(self._nodes)
+        self._max_workers = max_workers
+
+    def __call__(self, context: WorkflowContext):
+        context.info("🔀 %s", self)
+        with context.block_indent():
+            for level in self._levels:
+                if len(level) == 1:
+                    call_node(context, level[0])
+                else:
+                    self._call_level(context, level)
+
+    @property
+    def name(self) -> str:
+        return "Step graph"
+
+    def branches(self) -> Optional[Branches]:
+        return {"": self._nodes}
+
+    def _call_level(self, context: WorkflowContext, level: Sequence[Step]):
+        """Call a level of independent steps in a thread pool.
+
+        The first error raised by a step is re-raised once any running steps
+        have completed.
+        """
+        with ThreadPoolExecutor(self._max_workers) as executor:
+            futures = [executor.submit(call_node, context, node) for node in level]
+            for future in as_completed(futures):
+                if future.exception() is not None:
+                    for pending in futures:
+                        pending.cancel()
+                    future.result()
+
+
 class SetVar(Navigable):
     """Set context variable to specified values
 
@@ -207,27 +423,32 @@ class SetVar(Navigable):
 
     """
 
-    __slots__ = ("values",)
+    __slots__ = ("values", "_display_name", "_has_callables")
 
     def __init__(
         self,
         **values: Union[Any, Callable[[WorkflowContext], Any]],
     ):
         self.values = values
+        self._display_name = f"Set value(s) for {', '.join(values)}"
+        self._has_callables = any(callable(value) for value in values.values())
 
     def __call__(self, context: WorkflowContext):
         """Call object implementation."""
         context.info("📝 %s", self)
-        values = (
-            (key, value(context) if callable(value) else value)
-            for key, value in self.values.items()
-        )
-        context.state.update(values)
+        if self._has_callables:
+            context.state |= (
+                (key, value(context) if callable(value) else value)
+                for key, value in self.values.items()
+            )
+        else:
+            # Only constant values; merge directly
+            context.state |= self.values
 
     @property
     def name(self):
         """Name of the node."""
-        return f"Set value(s) for {', '.join(self.values)}"
+        return self._display_name
 
 
 class DefaultVar(Navigable):
@@ -245,13 +466,14 @@ class DefaultVar(Navigable):
         )
     """
 
-    __slots__ = ("values", )
+    __slots__ = ("values", "_display_name")
 
     def __init__(
         self,
         **values: Any | Callable[[WorkflowContext], Any],
     ):
         self.values = values
+        self._display_name = f"Default value(s) for {', '.join(values)}"
 
     def __call__(self, context: WorkflowContext):
         """Call object implementation."""
@@ -266,7 +488,7 @@ class DefaultVar(Navigable):
     @property
     def name(self):
         """Name of the node"""
-        return f"Default value(s) for {', '.join(self.values)}"
+        return self._display_name
 
 
 class Append(Navigable):
@@ -286,19 +508,22 @@ class Append(Navigable):
 
     """
 
-    __slots__ = ("target_var", "message")
+    __slots__ = ("target_var", "message", "_template")
 
     def __init__(self, target_var: str, message: str):
         self.target_var = target_var
         self.message = message
+        self._template = MessageTemplate(message)
 
     def __call__(self, context: WorkflowContext):
         """Call object implementation."""
-        message = context.format(self.message)
-        try:
-            context.state[self.target_var].append(message)
-        except KeyError:
-            context.state[self.target_var] = [message]
+        message = self._template.format(context)
+        state = context.state
+        var = state.get(self.target_var)
+        if var is None:
+            state[self.target_var] = [message]
+        else:
+            var.append(message)
 
     @property
     def name(self):
@@ -315,6 +540,13 @@ class CaptureErrors(Navigable):
 
     :param target_var: Name of the context variable with the list
     :param try_all: Call every node even if a previous node raised an exception.
+    :param except_types: Exception type(s) to capture; defaults to all exceptions.
+    :param parallel: Call nodes concurrently in a thread pool (requires
+        ``try_all``); nodes must be independent of each other. Each node is
+        called in a branch of the context so variables set by one node are
+        not visible to the others. Errors are captured in the order the nodes
+        were added.
+    :param max_workers: Maximum number of threads used for parallel nodes.
 
     .. code-block:: python
 
@@ -327,7 +559,16 @@ class CaptureErrors(Navigable):
 
     """
 
-    __slots__ = ("target_var", "_nodes", "try_all")
+    __slots__ = (
+        "target_var",
+        "_except_types",
+        "_except",
+        "_nodes",
+        "try_all",
+        "_display_name",
+        "_parallel",
+        "_max_workers",
+    )
 
     def __init__(
         self,
@@ -335,41 +576,93 @@ class CaptureErrors(Navigable):
         try_all: bool = True,
         *,
         except_types: Union[type, Sequence[type]] = None,
+        parallel: bool = False,
+        max_workers: int = None,
     ):
+        if parallel and not try_all:
+            raise WorkflowSetupError("Parallel capture errors requires try_all")
+
         self.target_var = target_var
         self.except_types = except_types
         self._nodes = []
         self.try_all = try_all
+        self._display_name = f"Capture errors into `{target_var}`"
+        self._parallel = parallel
+        self._max_workers = max_workers
 
     def __call__(self, context: WorkflowContext):
         """Call object implementation."""
         context.info("🥅 %s", self)
-        except_types = self.except_types
+        except_types = self._except
 
-        try:
-            var = context.state[self.target_var]
-        except KeyError:
+        var = context.state.get(self.target_var)
+        if var is None:
             var = context.state[self.target_var] = []
 
         with context:
-            for node in self._nodes:
+            if self._parallel:
+                var.extend(self._call_parallel(context))
+
+            elif self.try_all:
+                append = var.append
+                for node in self._nodes:
+                    try:
+                        call_node(context, node)
+                    except except_types as ex:
+                        append(ex)
+
+            else:
+                # Stops on the first error so a single handler covers all nodes
                 try:
-                    call_node(context, node)
-                except Exception as ex:
-                    if except_types and not isinstance(ex, except_types):
-                        raise
+                    for node in self._nodes:
+                        call_node(context, node)
+                except except_types as ex:
                     var.append(ex)
-                    if not self.try_all:
-                        break
 
     @property
     def name(self):
         """Name of the node."""
-        return f"Capture errors into `{self.target_var}`"
+        return self._display_name
 
     def branches(self) -> Optional[Branches]:
         return {"": tuple(self._nodes)}
 
+    def _call_parallel(self, context: WorkflowContext) -> List[Exception]:
+        """Call each node in a branch of the context returning captured errors.
+
+        Nodes are called in a thread pool, each with its own branch so nodes
+        that push scopes do not interfere with each other. An error that is not
+        captured is re-raised, with its flow trace, once all nodes have
+        completed.
+        """
+        with ThreadPoolExecutor(self._max_workers) as executor:
+            futures = []
+            for node in self._nodes:
+                branch = context.branch()
+                futures.append((executor.submit(call_node, branch, node), branch))
+
+        errors = []
+        for future, branch in futures:
+            ex = future.exception()
+            if ex is None:
+                continue
+            if not isinstance(ex, self._except):
+                context.merge_trace(branch)
+                raise ex
+            errors.append(ex)
+        return errors
+
+    @property
+    def except_types(self) -> Union[type, Sequence[type], None]:
+        """Exception type(s) to capture; all exceptions if not set."""
+        return self._except_types
+
+    @except_types.setter
+    def except_types(self, value: Union[type, Sequence[type], None]):
+        self._except_types = value
+        # Normalise exception types once so they can be used directly in except
+        self._except = _exception_tuple(value)
+
     def nodes(self, *nodes: Node) -> Self:
         """Add additional nodes."""
         self._nodes.extend(nodes)
@@ -401,25 +694,45 @@ class Conditional(Navigable):
 
     """
 
-    __slots__ = ("condition", "_true_nodes", "_false_nodes")
+    __slots__ = (
+        "condition",
+        "_condition_var",
+        "_true_nodes",
+        "_false_nodes",
+        "_branches",
+    )
 
     def __init__(self, condition: Union[str, Callable[[WorkflowContext], bool]]):
         if isinstance(condition, str):
             self.condition = lambda context: bool(context.state.get(condition))
+            self._condition_var = condition
         elif callable(condition):
             self.condition = condition
+            self._condition_var = None
         else:
             raise TypeError("condition not context variable name or callable")
 
         self._true_nodes = None
         self._false_nodes = None
+        # Branches indexed by the condition (False, True); None if no branches
+        self._branches = None
 
     def __call__(self, context: WorkflowContext):
         """Call object implementation."""
-        condition = self.condition(context)
+        branches = self._branches
+        if branches is None:
+            # Nothing to branch into; skip evaluating the condition
+            return
+
+        # Read a context variable condition directly rather than via a call
+        condition_var = self._condition_var
+        if condition_var is None:
+            condition = self.condition(context)
+        else:
+            condition = bool(context.state.get(condition_var))
         context.info("🔀 Condition is %s", bool(condition))
 
-        nodes = self._true_nodes if condition else self._false_nodes
+        nodes = branches[bool(condition)]
         if nodes:
             context.set_trace_args({"condition": condition})
             with context.block_indent():
@@ -436,13 +749,21 @@ class Conditional(Navigable):
     def true(self, *nodes: Node) -> Self:
         """Nodes to use for the true branch."""
         self._true_nodes = nodes
+        self._update_branches()
         return self
 
     def false(self, *nodes: Node) -> Self:
         """Nodes to use for the false branch."""
         self._false_nodes = nodes
+        self._update_branches()
         return self
 
+    def _update_branches(self):
+        if self._true_nodes or self._false_nodes:
+            self._branches = (self._false_nodes, self._true_nodes)
+        else:
+            self._branches = None
+
 
 If = Conditional
 
@@ -592,7 +913,7 @@ class LogMessage(Navigable):
 
     """
 
-    __slots__ = ("message", "level")
+    __slots__ = ("message", "level", "_template")
 
     @classmethod
     def debug(cls, message: str) -> "LogMessage":
@@ -617,11 +938,13 @@ class LogMessage(Navigable):
     def __init__(self, message: str, *, level: int = logging.INFO):
         self.message = message
         self.level = level
+        self._template = MessageTemplate(message)
 
     def __call__(self, context: WorkflowContext):
         """Call object implementation."""
-        message = context.format(self.message)
-        context.log(self.level, message)
+        # Only format the message if it will be logged
+        if context.logger.isEnabledFor(self.level):
+            context.log(self.level, self._template.format(context))
 
     @property
     def name(self):
@@ -645,6 +968,9 @@ class ForEach(Navigable):
         strings or a sequence of strings.
     :param in_var: Context variable containing a sequence of values to be
         iterated over.
+    :param parallel: Call each iteration in a thread pool; iterations must be
+        independent and only modify their own context scope.
+    :param max_workers: Maximum number of threads used for parallel iterations.
 
     .. code-block:: python
 
@@ -654,6 +980,12 @@ class ForEach(Navigable):
             .loop(log_message("- {message}"))
         )
 
+        # With parallel iterations
+        (
+            ForEach("url", in_var="urls", parallel=True, max_workers=8)
+            .loop(fetch_url)
+        )
+
         # With multiple target variables
         (
             ForEach("name, age", in_var="students")
@@ -662,38 +994,52 @@ class ForEach(Navigable):
 
     """
 
-    __slots__ = ("target_vars", "in_var", "_nodes", "_loop_label", "_update_context")
+    __slots__ = (
+        "target_vars",
+        "in_var",
+        "_nodes",
+        "_loop_label",
+        "_iterate",
+        "_display_name",
+        "_max_workers",
+    )
 
-    def __init__(self, target_vars: Union[str, Sequence[str]], in_var: str, *, loop_label: str = None):
+    def __init__(
+        self,
+        target_vars: Union[str, Sequence[str]],
+        in_var: str,
+        *,
+        loop_label: str = None,
+        parallel: bool = False,
+        max_workers: int = None,
+    ):
         self.target_vars = target_vars = var_list(target_vars)
         self.in_var = in_var
         self._nodes = []
         self._loop_label = loop_label or f"Next {self.target_vars_name}"
+        self._display_name = f"For {self.target_vars_name} in `{in_var}`"
 
-        if len(target_vars) == 1:
-            self._context_update = self._single_value(target_vars[0])
+        self._max_workers = max_workers
+
+        if parallel:
+            self._iterate = self._iterate_parallel
+        elif len(target_vars) == 1:
+            self._iterate = self._iterate_single_value
         else:
-            self._context_update = self._multiple_value(target_vars)
+            self._iterate = self._iterate_multiple_values
 
     def __call__(self, context: WorkflowContext):
         """Call object implementation."""
         context.info("🔁 %s", self)
         try:
-            iterable = context.state[self.in_var]
+            iterable = iter(context.state[self.in_var])
         except KeyError:
             raise WorkflowRuntimeError(f"Variable {self.in_var} not found in context")
-
-        if not isinstance(iterable, Iterable):
+        except TypeError:
             raise WorkflowRuntimeError(f"Variable {self.in_var} is not iterable")
 
         with context.block_indent():
-            for value in iterable:
-                pairs = self._context_update(value)
-                context.set_trace_args(pairs)
-                context.info("🔂 %s", self._loop_label)
-                with context:
-                    context.state.update(pairs)
-                    call_nodes(context, self._nodes)
+            self._iterate(context, iterable)
 
     @property
     def target_vars_name(self):
@@ -704,7 +1050,7 @@ class ForEach(Navigable):
     @property
     def name(self):
         """Name of the node."""
-        return f"For {self.target_vars_name} in `{self.in_var}`"
+        return self._display_name
 
     def branches(self) -> Optional[Branches]:
         return {"loop": self._nodes}
@@ -714,27 +1060,83 @@ class ForEach(Navigable):
         self._nodes = nodes
         return self
 
-    @staticmethod
-    def _single_value(target_var: str):
-        """Handle single value for target."""
-
-        def _values(value):
-            return {target_var: value}
+    def _iterate_single_value(self, context: WorkflowContext, iterable: Iterable):
+        """Iterate assigning each value to a single target var."""
+        (target_var,) = self.target_vars
+        nodes = self._nodes
+        loop_label = self._loop_label
+        set_trace_args = context.set_trace_args
+        info = context.info
+
+        for value in iterable:
+            set_trace_args({target_var: value})
+            info("🔂 %s", loop_label)
+            with context:
+                context.state[target_var] = value
+                call_nodes(context, nodes)
 
-        return _values
+    def _iterate_multiple_values(self, context: WorkflowContext, iterable: Iterable):
+        """Iterate unpacking each value into multiple target vars."""
+        target_vars = self.target_vars
+        nodes = self._nodes
+        loop_label = self._loop_label
+        unpack_values = self._unpack_values
+        set_trace_args = context.set_trace_args
+        info = context.info
+
+        for values in iterable:
+            pairs = unpack_values(target_vars, values)
+            set_trace_args(pairs)
+            info("🔂 %s", loop_label)
+            with context:
+                context.state.update(pairs)
+                call_nodes(context, nodes)
 
-    def _multiple_value(self, target_vars: Sequence[str]):
-        """Handle multiple value for target."""
+    def _iterate_parallel(self, context: WorkflowContext, iterable: Iterable):
+        """Iterate calling each iteration in a branch of the context.
 
-        def _values(values):
-            try:
-                return dict(zip(target_vars, values))
-            except (TypeError, ValueError):
-                raise WorkflowRuntimeError(
-                    f"Value {values} from {self.in_var} is not iterable"
-                )
-
-        return _values
+        Iterations are called in a thread pool; the first error raised by an
+        iteration is re-raised once any running iterations have completed
+        along with the flow trace of the failed iteration.
+        """
+        target_vars = self.target_vars
+        if len(target_vars) == 1:
+            (target_var,) = target_vars
+            values_pairs = [{target_var: value} for value in iterable]
+        else:
+            values_pairs = [
+                self._unpack_values(target_vars, values) for values in iterable
+            ]
+
+        with ThreadPoolExecutor(self._max_workers) as executor:
+            branches = {}
+            for pairs in values_pairs:
+                branch = context.branch()
+                branches[executor.submit(self._call_branch, branch, pairs)] = branch
+
+            for future in as_completed(branches):
+                if future.exception() is not None:
+                    for pending in branches:
+                        pending.cancel()
+                    context.merge_trace(branches[future])
+                    future.result()
+
+    def _call_branch(self, context: WorkflowContext, pairs: Dict[str, Any]):
+        """Call nodes for a single iteration in a branch context."""
+        context.state.update(pairs)
+        context.info("🔂 %s", self._loop_label)
+        call_nodes(context, self._nodes)
+
+    def _unpack_values(
+        self, target_vars: Sequence[str], values: Any
+    ) -> Dict[str, Any]:
+        """Unpack values into the target vars."""
+        try:
+            return dict(zip(target_vars, values))
+        except (TypeError, ValueError):
+            raise WorkflowRuntimeError(
+                f"Value {values} from {self.in_var} is not iterable"
+            )
 
 
 class TryExcept(Navigable):
@@ -751,7 +1153,7 @@ class TryExcept(Navigable):
         )
     """
 
-    __slots__ = ("_nodes", "_exceptions")
+    __slots__ = ("_nodes", "_exceptions", "_finally")
 
     def __init__(self, *nodes: Node):
         self._nodes = nodes
@@ -810,7 +1212,7 @@ class TryUntil(Navigable):
         )
     """
 
-    __slots__ = ("except_types", "_nodes", "_default")
+    __slots__ = ("_except_types", "_except", "_nodes", "_default")
 
     def __init__(
         self,
@@ -825,23 +1227,37 @@ class TryUntil(Navigable):
     def __call__(self, context: WorkflowContext):
         """Call object implementation."""
         context.info("🔁 %s", self)
+        except_types = self._except
 
         for node in self._nodes:
             try:
                 call_node(context, node)
-            except self.except_types:
+            except except_types:
                 continue
             else:
                 break
         else:
-            if self._default:
-                call_node(context, self._default)
+            default = self._default
+            if default:
+                call_node(context, default)
 
     @property
     def name(self) -> str:
         """Name of the node."""
         return f"Try until a node does not raise {self.except_types}"
 
+    @property
+    def except_types(self) -> Union[Type[Exception], Sequence[Type[Exception]]]:
+        """Exception type(s) to catch."""
+        return self._except_types
+
+    @except_types.setter
+    def except_types(
+        self, value: Union[Type[Exception], Sequence[Type[Exception]]]
+    ):
+        self._except_types = value
+        self._except = _exception_tuple(value, StepFailedError)
+
     def branches(self) -> Optional[Branches]:
         return {"": self._nodes}
 
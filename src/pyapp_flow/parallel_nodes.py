@@ -1,9 +1,37 @@
 """Parallel Nodes"""
 import importlib
 import enum
-from functools import cached_property
+import os
+import pickle
+import struct
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from itertools import islice
 from multiprocessing import Pool
-from typing import Optional, Callable, Iterable, Any, Dict, Tuple, Sequence, Union
+from typing import (
+    Optional,
+    Callable,
+    Iterable,
+    Any,
+    Dict,
+    Tuple,
+    Sequence,
+    Union,
+    List,
+)
+
+try:
+    from multiprocessing.shared_memory import SharedMemory
+except ImportError:  # pragma: no cover - Platform without shared memory support
+    SharedMemory = None
+else:
+    from multiprocessing import resource_tracker
+
+try:
+    import cloudpickle
+except ImportError:
+    cloudpickle = None
 
 from pyapp_flow import Navigable, WorkflowContext, Branches
 from pyapp_flow.errors import WorkflowRuntimeError, FatalError
@@ -17,6 +45,13 @@ class MergeMethod(enum.Enum):
     Extend = "extend"
 
 
+class Backend(enum.Enum):
+    """Backend used to execute a parallel node."""
+
+    Process = "process"
+    Thread = "thread"
+
+
 def import_node(node_id: str) -> Callable[[WorkflowContext], Any]:
     """Import a node."""
     module_name, _, func = node_id.rpartition(":")
@@ -24,15 +59,154 @@ def import_node(node_id: str) -> Callable[[WorkflowContext], Any]:
     return getattr(module, func)
 
 
-def _call_parallel_node(node_id, context_data, return_vars):
-    """Wrapper to call parallel nodes."""
+def _dump_node(node: Callable[[WorkflowContext], Any]) -> bytes:
+    """Pickle a node so it can be sent to worker processes.
+
+    If cloudpickle is installed it is used so lambdas and closures can be sent,
+    otherwise the node must be picklable by reference.
+    """
+    dumps = cloudpickle.dumps if cloudpickle is not None else pickle.dumps
+    return dumps(node)
+
+
+def _share_data(data: Any) -> "SharedMemory":
+    """Pickle data into a new shared memory block.
+
+    Pickle protocol 5 is used so large buffers (eg bytes or numpy arrays) are
+    written out-of-band rather than being copied into the pickle stream. The
+    block is laid out as a header of segment sizes followed by the segments.
+    """
+    buffers = []
+    payload = pickle.dumps(data, protocol=5, buffer_callback=buffers.append)
+    segments = [memoryview(payload), *(buffer.raw() for buffer in buffers)]
+    header = struct.pack(
+        f"<{len(segments) + 1}Q", len(segments), *(s.nbytes for s in segments)
+    )
+
+    shm = SharedMemory(
+        create=True, size=len(header) + sum(s.nbytes for s in segments)
+    )
+    offset = len(header)
+    shm.buf[:offset] = header
+    for segment in segments:
+        shm.buf[offset : offset + segment.nbytes] = segment
+        offset += segment.nbytes
+    return shm
+
+
+def _load_shared_data(name: str) -> Any:
+    """Load data from a shared memory block created by :func:`_share_data`."""
+    shm = SharedMemory(name=name)
     try:
-        node = import_node(node_id)
-    except (AttributeError, ImportError) as ex:
-        raise FatalError(f"Unable to import parallel node: {ex}")
+        buf = shm.buf
+        (count,) = struct.unpack_from("<Q", buf)
+        sizes = struct.unpack_from(f"<{count}Q", buf, 8)
+        offset = 8 * (count + 1)
+        segments = []
+        for size in sizes:
+            segments.append(bytes(buf[offset : offset + size]))
+            offset += size
+        del buf
+    finally:
+        shm.close()
+
+    payload, *buffers = segments
+    return pickle.loads(payload, buffers=buffers)
+
+
+def _release_shared_data(shm: "SharedMemory"):
+    """Release a shared memory block created by :func:`_share_data`."""
+    shm.close()
+    shm.unlink()
+
+
+# Node loaded by the pool initializer; one per worker process
+_worker_node: Optional[Callable[[WorkflowContext], Any]] = None
+_worker_import_error: Optional[Exception] = None
+
+
+def _worker_init(node_ref: Union[str, bytes]):
+    """Pool initializer; load the node once per worker process.
+
+    The node reference is either a node ID to import or a pickled node.
+
+    Any error is deferred until a task is called so it is reported back to the
+    parent, an exception raised from a pool initializer kills the worker.
+    """
+    global _worker_node, _worker_import_error
+    try:
+        if isinstance(node_ref, bytes):
+            _worker_node = pickle.loads(node_ref)
+        else:
+            _worker_node = import_node(node_ref)
+    except Exception as ex:
+        _worker_node = None
+        _worker_import_error = ex
+    else:
+        _worker_import_error = None
+
+
+# Shared data loaded by the worker; keyed by the shared memory block name
+_worker_shared_data: Tuple[Optional[str], Dict[str, Any]] = (None, {})
+
+
+def _shared_data(shared: Union[str, Dict[str, Any], None]) -> Dict[str, Any]:
+    """Get shared data, loaded once per worker for each shared memory block.
+
+    Shared data is either the name of a shared memory block or the data itself
+    on platforms without shared memory.
+    """
+    global _worker_shared_data
+    if not isinstance(shared, str):
+        return shared or {}
+
+    name, data = _worker_shared_data
+    if name != shared:
+        data = _load_shared_data(shared)
+        _worker_shared_data = shared, data
+    return data
 
-    # Generate context and call node
-    context = WorkflowContext(**context_data)
+
+def _call_parallel_batch(values, target_var, return_vars, merge_methods, shared=None):
+    """Wrapper to call parallel nodes for a batch of values.
+
+    Values are either a list or the name of a shared memory block containing
+    the list.
+
+    A single context is created for the batch, each value is called in a new
+    state scope of that context. Return values are merged in the worker so a
+    single list is returned for each return variable.
+    """
+    node = _worker_node
+    if node is None:
+        ex = _worker_import_error
+        if isinstance(ex, (AttributeError, ImportError)):
+            raise FatalError(f"Unable to import parallel node: {ex}")
+        raise ex
+
+    if isinstance(values, str):
+        values = _load_shared_data(values)
+
+    context = WorkflowContext(**_shared_data(shared))
+    return merge_nested_entries(
+        _call_node_in_scope(node, context, target_var, values, return_vars),
+        merge_methods,
+    )
+
+
+def _call_node_in_scope(node, context, target_var, values, return_vars):
+    """Call a node for each value in a new state scope of the context."""
+    for value in values:
+        with context:
+            state = context.state
+            state[target_var] = value
+            node(context)
+            yield tuple(state[var] for var in return_vars)
+
+
+def _call_thread_node(value, node, target_var, return_vars, shared_data):
+    """Call a node for a value in a new context and return requested variables."""
+    context = WorkflowContext(**{**shared_data, target_var: value})
     node(context)
 
     # Generate return values from context
@@ -40,30 +214,176 @@ def _call_parallel_node(node_id, context_data, return_vars):
     return tuple(state[var] for var in return_vars)
 
 
+def _batches(values: Iterable[Any], batch_size: int) -> Iterable[List[Any]]:
+    """Split values into batches of (at most) batch size."""
+    iterator = iter(values)
+    while batch := list(islice(iterator, batch_size)):
+        yield batch
+
+
 class _ParallelNode:
-    """Wrapper around multiprocessing pool to do actual parallel processing."""
+    """Wrapper around multiprocessing pool to do actual parallel processing.
+
+    Worker pools are persistent; call ``close`` (or use the node as a context
+    manager) to shut down the worker processes.
+    """
 
     __slots__ = ()
 
     pool_type = Pool
 
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        """Close worker pools and wait for the worker processes to exit."""
+        pools, self._pools = self._pools, {}
+        for pool in pools.values():
+            pool.close()
+            pool.join()
+
     def _map_to_pool(
         self,
-        node_id: str,
-        context_iter: Iterable[Dict[str, Any]],
+        node_ref: Union[str, bytes],
+        target_var: str,
+        values: Sequence[Any],
+        return_vars: Sequence[str],
+        merge_methods: Sequence[str],
+        shared_data: Dict[str, Any] = None,
+        batch_size: int = None,
+        share_values: bool = False,
+    ) -> Iterable[Sequence[list]]:
+        """Map values into a node.
+
+        Uses a parallel worker pool; results are yielded in order as they are
+        returned from the workers. Values are sent to workers in batches to
+        reduce the IPC overhead of each task, if a batch size is not supplied
+        it is derived from the number of values and workers. Each worker merges
+        the return values of a batch, so the merged values for each batch are
+        yielded.
+
+        Shared data is pickled once into a shared memory block that is loaded
+        by each worker, rather than being sent with every batch. If values are
+        shared, each batch is pickled into a shared memory block and only the
+        name of the block is sent to a worker (see :meth:`_map_shared_batches`).
+        """
+        share_values = share_values and SharedMemory is not None
+        use_shared_memory = SharedMemory is not None and bool(shared_data)
+        if (use_shared_memory or share_values) and os.name == "posix":
+            # Workers must share the resource tracker that owns shared memory
+            # blocks; so it has to be running before the pool is started.
+            resource_tracker.ensure_running()
+
+        pool = self._pool(node_ref)
+        batches = _batches(values, batch_size or self._default_batch_size(values))
+        call = partial(
+            _call_parallel_batch,
+            target_var=target_var,
+            return_vars=return_vars,
+            merge_methods=merge_methods,
+        )
+
+        shm = None
+        try:
+            if use_shared_memory:
+                shm = _share_data(shared_data)
+                call = partial(call, shared=shm.name)
+            else:
+                call = partial(call, shared=shared_data)
+
+            if share_values:
+                yield from self._map_shared_batches(pool, call, batches)
+            else:
+                yield from pool.imap(call, batches)
+
+        finally:
+            if shm is not None:
+                _release_shared_data(shm)
+
+    @staticmethod
+    def _map_shared_batches(
+        pool, call: Callable, batches: Iterable[List[Any]], window: int = None
+    ) -> Iterable[Sequence[list]]:
+        """Map batches that are sent to workers via shared memory blocks.
+
+        A block is created as each batch is submitted, with at most ``window``
+        batches (by default two per CPU) in flight at a time so only part of
+        the values are held in shared memory. Each block is released once the
+        results of its batch are returned; results are yielded in order.
+        """
+        window = window or 2 * (os.cpu_count() or 1)
+        pending = deque()
+
+        def next_results():
+            block, result = pending.popleft()
+            try:
+                return result.get()
+            finally:
+                _release_shared_data(block)
+
+        try:
+            for batch in batches:
+                block = _share_data(batch)
+                pending.append((block, pool.apply_async(call, (block.name,))))
+                if len(pending) >= window:
+                    yield next_results()
+
+            while pending:
+                yield next_results()
+
+        finally:
+            for block, _ in pending:
+                _release_shared_data(block)
+
+    @staticmethod
+    def _map_to_threads(
+        node: Callable[[WorkflowContext], Any],
+        target_var: str,
+        values: Iterable[Any],
         return_vars: Sequence[str],
-    ) -> Sequence[Any]:
-        """Map an iterable of context entries into a node.
+        shared_data: Dict[str, Any] = None,
+    ) -> Iterable[Tuple[Any, ...]]:
+        """Map values into a node using a thread pool.
 
-        Uses a parallel worker pool."""
-        return self._pool.starmap(
-            _call_parallel_node,
-            ((node_id, context_data, return_vars) for context_data in context_iter),
+        No pickling is required; shared data is passed to each node as is.
+        """
+        call = partial(
+            _call_thread_node,
+            node=node,
+            target_var=target_var,
+            return_vars=return_vars,
+            shared_data=shared_data or {},
         )
+        with ThreadPoolExecutor() as executor:
+            yield from executor.map(call, values)
+
+    @staticmethod
+    def _default_batch_size(values: Sequence[Any], processes: int = None) -> int:
+        """Determine the number of values to send to a worker at a time.
 
-    @cached_property
-    def _pool(self):
-        return self.pool_type()
+        Values are split into around four batches per worker process (pools
+        are created with one process per CPU), rounding up in the same way as
+        ``Pool.map`` determines a chunk size.
+        """
+        processes = processes or os.cpu_count() or 1
+        batch_size, extra = divmod(len(values), 4 * processes)
+        return max(1, batch_size + bool(extra))
+
+    def _pool(self, node_ref: Union[str, bytes]):
+        """Get the worker pool for a node; created on first use.
+
+        Pools are persistent, each worker loads the node once on startup.
+        """
+        try:
+            return self._pools[node_ref]
+        except KeyError:
+            pool = self._pools[node_ref] = self.pool_type(
+                initializer=_worker_init, initargs=(node_ref,)
+            )
+            return pool
 
 
 class MapNode(Navigable, _ParallelNode):
@@ -80,6 +400,9 @@ class MapNode(Navigable, _ParallelNode):
         strings or a sequence of strings.
     :param in_var: Context variable containing a sequence of values to be
         iterated over.
+    :param backend: Execute nodes in a pool of worker processes (the default)
+        or in a pool of threads. The thread backend avoids pickling values and
+        is suited to I/O bound nodes or nodes that release the GIL.
 
     .. code-block:: python
 
@@ -96,56 +419,152 @@ class MapNode(Navigable, _ParallelNode):
             .merge_var("results")
         )
 
-    """
+        # Mapping with a node object rather than a node ID
+        (
+            MapNodes("message", in_var="messages")
+            .loop(log_message("{message}"))
+        )
+
+        # Mapping an I/O bound node with a thread pool
+        (
+            MapNodes("url", in_var="urls", backend="thread")
+            .loop("namespace:fetch_url")
+            .merge_var("responses")
+        )
 
-    __slots__ = ("target_var", "in_var", "_merge_vars", "_node_id")
+        # Mapping with a large read-only variable shared with each worker
+        (
+            MapNodes("message", in_var="messages")
+            .loop("namespace:node_name")
+            .shared_vars("lookup_table")
+        )
+
+        # Mapping with a fixed number of values sent to a worker per task
+        (
+            MapNodes("message", in_var="messages")
+            .loop("namespace:node_name")
+            .batch(100)
+        )
+
+        # Mapping large values (eg numpy arrays) via shared memory
+        (
+            MapNodes("image", in_var="images")
+            .loop("namespace:node_name")
+            .share_values()
+        )
 
-    def __init__(self, target_var: str, in_var: str):
+    """
+
+    __slots__ = (
+        "target_var",
+        "in_var",
+        "_merge_vars",
+        "_shared_vars",
+        "_node",
+        "_node_ref",
+        "_pools",
+        "_display_name",
+        "_batch_size",
+        "_share_values",
+        "backend",
+    )
+
+    def __init__(
+        self,
+        target_var: str,
+        in_var: str,
+        *,
+        backend: Union[str, Backend] = Backend.Process,
+    ):
         self.target_var = target_var
         self.in_var = in_var
+        self.backend = Backend(backend)
         self._merge_vars = []
-        self._node_id = None
+        self._shared_vars = ()
+        self._node = None
+        self._node_ref = None
+        self._pools = {}
+        self._display_name = f"Map ({target_var}) in `{in_var}`"
+        self._batch_size = None
+        self._share_values = False
 
     def __call__(self, context: WorkflowContext):
         context.info("🔁 %s", self)
         try:
-            iterable = context.state[self.in_var]
+            iterable = iter(context.state[self.in_var])
         except KeyError:
             raise WorkflowRuntimeError(f"Variable {self.in_var} not found in context")
-
-        if not isinstance(iterable, Iterable):
+        except TypeError:
             raise WorkflowRuntimeError(f"Variable {self.in_var} is not iterable")
 
-        if self._node_id:
+        try:
+            shared_data = {var: context.state[var] for var in self._shared_vars}
+        except KeyError as ex:
+            raise WorkflowRuntimeError(f"Variable {ex.args[0]} not found in context")
+
+        if self._node is not None:
+            target_var = self.target_var
             result_vars = [name for name, _ in self._merge_vars]
-            results = self._map_to_pool(
-                self._node_id,
-                ({self.target_var: value} for value in iterable),
-                result_vars,
-            )
-            context.state.update(
-                zip(
-                    result_vars,
-                    merge_nested_entries(
-                        results, [merge for _, merge in self._merge_vars]
+            merge_methods = [merge for _, merge in self._merge_vars]
+            if self.backend is Backend.Thread:
+                node = self._node
+                if isinstance(node, str):
+                    try:
+                        node = import_node(node)
+                    except (AttributeError, ImportError) as ex:
+                        raise FatalError(f"Unable to import parallel node: {ex}")
+                results = merge_nested_entries(
+                    self._map_to_threads(
+                        node, target_var, iterable, result_vars, shared_data
                     ),
+                    merge_methods,
                 )
-            )
+            else:
+                # Values are merged by the workers; combine merged batches
+                results = merge_nested_entries(
+                    self._map_to_pool(
+                        self._process_node_ref(),
+                        target_var,
+                        list(iterable),
+                        result_vars,
+                        merge_methods,
+                        shared_data,
+                        self._batch_size,
+                        self._share_values,
+                    ),
+                    [MergeMethod.Extend.value] * len(result_vars),
+                )
+            context.state.update(zip(result_vars, results))
 
     @property
     def name(self):
         """Name of node."""
-        return f"Map ({self.target_var}) in `{self.in_var}`"
+        return self._display_name
 
     def branches(self) -> Optional[Branches]:
         """Branches to call on each iteration of the foreach block."""
-        return {"loop": [self._node_id]}
+        return {"loop": [self._node]}
+
+    def loop(self, node: Union[str, Callable[[WorkflowContext], Any]]) -> "MapNode":
+        """Node to call on each iteration of the foreach block.
 
-    def loop(self, node: str) -> "MapNode":
-        """Nodes to call on each iteration of the foreach block."""
-        self._node_id = node
+        The node is either a node ID (``"module.name:node_name"``) that each
+        worker imports or a node that is pickled once and sent to each worker.
+        Lambdas and closures (eg nodes created by ``failed``) can be sent if
+        cloudpickle is installed. Nodes are only pickled for the process
+        backend, the thread backend calls the node directly.
+        """
+        self._node = node
+        self._node_ref = node if isinstance(node, str) else None
         return self
 
+    def _process_node_ref(self) -> Union[str, bytes]:
+        """Reference to the node sent to worker processes; pickled on first use."""
+        node_ref = self._node_ref
+        if node_ref is None:
+            node_ref = self._node_ref = _dump_node(self._node)
+        return node_ref
+
     def merge_vars(self, *merge_vars: Union[str, Tuple[str, MergeMethod]]) -> "MapNode":
         """Vars to merge back from parallel execution.
 
@@ -163,3 +582,34 @@ class MapNode(Navigable, _ParallelNode):
                 var, method = merge_var
             _merge_vars.append((var, method.value))
         return self
+
+    def batch(self, batch_size: int) -> "MapNode":
+        """Number of values sent to a worker process in each task.
+
+        By default, the batch size is derived from the number of values and
+        the number of worker processes.
+        """
+        if batch_size < 1:
+            raise ValueError("Batch size must be at least 1")
+        self._batch_size = batch_size
+        return self
+
+    def share_values(self, share: bool = True) -> "MapNode":
+        """Send values to worker processes via shared memory.
+
+        Each batch of values is pickled into a shared memory block and only
+        the name of the block is sent to a worker. This is useful when values
+        are large eg bytes or numpy arrays, as buffers are written out-of-band.
+        """
+        self._share_values = share
+        return self
+
+    def shared_vars(self, *shared_vars: str) -> "MapNode":
+        """Vars from the current context to share with parallel execution.
+
+        Shared variables are pickled once into a shared memory block and
+        loaded by each worker process, rather than being sent with every
+        value. This is useful for large read-only values eg lookup tables.
+        """
+        self._shared_vars = shared_vars
+        return self
@@ -1,6 +1,6 @@
 """Builtin flow steps."""
 
-from .datastructures import WorkflowContext
+from .datastructures import WorkflowContext, MessageTemplate
 from .errors import FatalError, StepFailedError
 from .nodes import Step, step
 
@@ -19,9 +19,11 @@ def failed(message: str) -> Step:
 
     """
 
+    template = MessageTemplate(message)
+
     @step
     def _step(context: WorkflowContext):
-        raise StepFailedError(context.format(message))
+        raise StepFailedError(template.format(context))
 
     return _step
 
@@ -40,9 +42,11 @@ def fatal(message: str) -> Step:
 
     """
 
+    template = MessageTemplate(message)
+
     @step
     def _step(context: WorkflowContext):
-        raise FatalError(context.format(message))
+        raise FatalError(template.format(context))
 
     return _step
 
@@ -28,8 +28,9 @@ def call_node(
             assert actual == "978-0553283686"
 
     """
-    if workflow_context:
-        workflow_context.state.update(context_vars)
+    if workflow_context is not None:
+        if context_vars:
+            workflow_context.state.update(context_vars)
     else:
         workflow_context = WorkflowContext(**context_vars)
     functions.call_node(workflow_context, node)
@@ -1,6 +1,8 @@
 from pathlib import Path
 import pytest
 
+from pyapp_flow import WorkflowContext
+
 
 here = Path(__file__).parent
 
@@ -8,3 +10,9 @@ here = Path(__file__).parent
 @pytest.fixture
 def fixture_path():
     return here / "fixtures"
+
+
+@pytest.fixture
+def empty_context():
+    """Workflow context with no initial state."""
+    return WorkflowContext()
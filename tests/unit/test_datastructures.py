@@ -1,4 +1,6 @@
 import logging
+import pickle
+from unittest.mock import Mock
 
 import pytest
 
@@ -66,6 +68,35 @@ class TestWorkflowContext:
 
         assert actual == expected
 
+    def test_branch(self):
+        target = datastructures.WorkflowContext(var_a=1, var_b=2)
+
+        actual = target.branch()
+        actual.state.var_a = 3
+
+        assert actual.depth == target.depth + 1
+        assert actual.state.var_a == 3
+        assert target.state.var_a == 1
+        assert actual.logger is target.logger
+
+    def test_trace__where_trace_limit_is_set(self):
+        target = datastructures.WorkflowContext(trace_limit=2)
+        nodes = [Mock(), Mock(), Mock()]
+
+        with target:
+            for node in nodes:
+                target.trace(node)
+
+            actual = target.state["__trace"]
+
+        assert list(actual) == [(nodes[1], {}), (nodes[2], {})]
+        assert "trace_limit" not in target.state
+
+    @pytest.mark.parametrize("trace_limit", (0, -1))
+    def test_init__where_trace_limit_is_invalid(self, trace_limit):
+        with pytest.raises(ValueError):
+            datastructures.WorkflowContext(trace_limit=trace_limit)
+
     def test_state(self):
         target = datastructures.WorkflowContext(var_a=1, var_b=2)
 
@@ -146,6 +177,68 @@ class TestWorkflowContext:
 
         assert actual == ("pyapp_flow", expected_level, f"  {message}")
 
+    def test_logging__where_level_disabled(self, caplog):
+        caplog.set_level(logging.WARNING)
+        target = datastructures.WorkflowContext(var_a=1, var_b=2)
+
+        target.info("Log an info message")
+
+        assert caplog.record_tuples == []
+
+
+class TestMessageTemplate:
+    @pytest.mark.parametrize(
+        "message, expected",
+        (
+            ("Foo", "Foo"),
+            ("Foo {{var_a}}", "Foo {var_a}"),
+            ("Foo {var_a}", "Foo Bar"),
+            ("Foo {var_b:03d}", "Foo 042"),
+            ("Foo {var_a!r:>6}", "Foo  'Bar'"),
+            ("{var_a}{var_a}}}", "BarBar}"),
+            ("Foo {var_b:{var_a}}", "Foo {var_b:{var_a}}"),
+            ("Foo {var_d[0]}", "Foo a"),
+            # Bad
+            ("Foo {var_c}", "Foo {var_c}"),
+            ("Foo {var_b:03z}", "Foo {var_b:03z}"),
+            ("Foo {var_a", "Foo {var_a"),
+        ),
+    )
+    def test_format(self, message, expected):
+        context = datastructures.WorkflowContext(var_a="Bar", var_b=42, var_d="abc")
+        target = datastructures.MessageTemplate(message)
+
+        actual = target.format(context)
+
+        assert actual == expected
+
+    def test_format__where_message_is_constant(self, monkeypatch):
+        context = datastructures.WorkflowContext(var_a="Bar")
+        target = datastructures.MessageTemplate("Foo {{var_a}}")
+        monkeypatch.setattr(datastructures.WorkflowContext, "format", None)
+
+        actual = target.format(context)
+
+        assert actual == "Foo {var_a}"
+
+    def test_format__where_message_is_compiled(self, monkeypatch):
+        context = datastructures.WorkflowContext(var_a="Bar")
+        target = datastructures.MessageTemplate("Foo \"{var_a}\" \\n")
+        monkeypatch.setattr(datastructures.WorkflowContext, "format", None)
+
+        actual = target.format(context)
+
+        assert actual == 'Foo "Bar" \\n'
+
+    def test_pickle(self):
+        context = datastructures.WorkflowContext(var_a="Bar")
+        target = datastructures.MessageTemplate("Foo {var_a}")
+
+        actual = pickle.loads(pickle.dumps(target))
+
+        assert actual.message == "Foo {var_a}"
+        assert actual.format(context) == "Foo Bar"
+
 
 class TestDescribeContext:
     def test_init(self):
@@ -112,3 +112,27 @@ class TestWorkflow:
 
     def test_str(self):
         assert str(sub_flow) == "Sub Flow"
+
+    def test_nodes__where_consecutive_set_vars_are_fused(self):
+        target = (
+            flow.Workflow("Fused")
+            .nodes(flow.SetVar(var_a=1), flow.SetVar(var_b=lambda ctx: ctx.state.var_a))
+            .set_vars(var_c=3)
+        )
+
+        actual = target.execute()
+
+        assert len(target._nodes) == 1
+        assert str(target._nodes[0]) == "Set value(s) for var_a, var_b, var_c"
+        assert (actual.state.var_a, actual.state.var_b, actual.state.var_c) == (1, 1, 3)
+
+    def test_nodes__where_set_vars_set_the_same_variable(self):
+        target = flow.Workflow("Not fused").nodes(
+            flow.SetVar(var_a=1),
+            flow.SetVar(var_a=lambda ctx: ctx.state.var_a + 1),
+        )
+
+        actual = target.execute()
+
+        assert len(target._nodes) == 2
+        assert actual.state.var_a == 2
@@ -1,8 +1,9 @@
+from dataclasses import dataclass
 from typing import Tuple
 
 import pytest
 
-from pyapp_flow import functions, WorkflowContext
+from pyapp_flow import functions, nodes, WorkflowContext
 from pyapp_flow.errors import WorkflowSetupError, SkipStep
 
 
@@ -63,43 +64,118 @@ def valid_i(*, var_a: str, var_b: int = 42) -> str:
     return foo
 
 
-@pytest.mark.parametrize(
-    "func, expected",
-    (
-        (valid_a, ({}, "context")),
-        (valid_b, ({"var_a": str}, "context")),
-        (valid_c, ({"var_a": str}, "context")),
-        (valid_d, ({"var_a": str, "var_b": int}, "context")),
-        (valid_e, ({}, None)),
-        (valid_f, ({"var_a": str}, None)),
-        (valid_g, ({"var_a": str, "var_b": int}, None)),
-        (valid_h, ({"var_a": str, "var_b": int}, None)),
-        (valid_i, ({"var_a": str, "var_b": int}, None)),
-    ),
+EXTRACT_INPUTS_CASES = (
+    (valid_a, ({}, "context")),
+    (valid_b, ({"var_a": str}, "context")),
+    (valid_c, ({"var_a": str}, "context")),
+    (valid_d, ({"var_a": str, "var_b": int}, "context")),
+    (valid_e, ({}, None)),
+    (valid_f, ({"var_a": str}, None)),
+    (valid_g, ({"var_a": str, "var_b": int}, None)),
+    (valid_h, ({"var_a": str, "var_b": int}, None)),
+    (valid_i, ({"var_a": str, "var_b": int}, None)),
 )
+
+
+@pytest.mark.parametrize("func, expected", EXTRACT_INPUTS_CASES)
 def test_extract_inputs__where_args_are_valid(func, expected):
     actual = functions.extract_inputs(func)
 
     assert actual == expected
 
 
+class CallableStep:
+    def __call__(self, var_a: str, *, context: WorkflowContext) -> int:
+        pass
+
+    def method(self, var_a: str, var_b: int) -> str:
+        pass
+
+
+@dataclass
+class UnhashableCallableStep:
+    """Dataclasses with eq (the default) are not hashable."""
+
+    value: str
+
+    def __call__(self, var_a: str) -> str:
+        return self.value + var_a
+
+
 @pytest.mark.parametrize(
-    "func, names, expected",
+    "func, expected",
     (
-        (valid_e, "var_a", (("var_a", int),)),
-        (valid_e, ("var_a",), (("var_a", int),)),
-        (valid_f, "var_b", (("var_b", str),)),
-        (valid_f, ("var_b",), (("var_b", str),)),
-        (valid_g, "var_a", (("var_a", Tuple[str, int]),)),
-        (valid_g, ("var_a", "var_b"), (("var_a", str), ("var_b", int))),
+        (CallableStep(), ({"var_a": str}, "context")),
+        (CallableStep().method, ({"var_a": str, "var_b": int}, None)),
     ),
 )
+def test_extract_inputs__where_func_is_bound(func, expected):
+    actual = functions.extract_inputs(func)
+
+    assert actual == expected
+
+
+def test_extract_inputs__where_callable_object_is_unhashable():
+    actual = functions.extract_inputs(UnhashableCallableStep("foo"))
+
+    assert actual == ({"var_a": str}, None)
+
+
+def test_extract_inputs__where_cache_is_shared_by_instances():
+    actual = functions.extract_inputs(CallableStep())
+
+    assert functions.extract_inputs(CallableStep()) is actual
+
+
+def test_step__where_callable_object_is_unhashable():
+    target = nodes.Step(UnhashableCallableStep("foo"), output="var_b")
+
+    actual = target(WorkflowContext(var_a="bar"))
+
+    assert actual == "foobar"
+
+
+def test_extract_outputs__where_func_is_a_callable_object():
+    actual = functions.extract_outputs(CallableStep(), "var_c")
+
+    assert actual == (("var_c", int),)
+
+
+def test_extract_inputs__where_result_is_cached():
+    actual = functions.extract_inputs(valid_d)
+
+    assert functions.extract_inputs(valid_d) is actual
+
+
+def test_extract_inputs__where_cache_is_bounded():
+    actual = functions._extract_inputs.cache_info().maxsize
+
+    assert actual == functions.SIGNATURE_CACHE_SIZE
+
+
+EXTRACT_OUTPUTS_CASES = (
+    (valid_e, "var_a", (("var_a", int),)),
+    (valid_e, ("var_a",), (("var_a", int),)),
+    (valid_f, "var_b", (("var_b", str),)),
+    (valid_f, ("var_b",), (("var_b", str),)),
+    (valid_g, "var_a", (("var_a", Tuple[str, int]),)),
+    (valid_g, ("var_a", "var_b"), (("var_a", str), ("var_b", int))),
+)
+
+
+@pytest.mark.parametrize("func, names, expected", EXTRACT_OUTPUTS_CASES)
 def test_extract_outputs__where_args_are_valid(func, names, expected):
     actual = functions.extract_outputs(func, names)
 
     assert actual == expected
 
 
+def test_extract_outputs__where_names_is_a_list():
+    actual = functions.extract_outputs(valid_g, ["var_a", "var_b"])
+
+    assert actual == (("var_a", str), ("var_b", int))
+
+
 def invalid_a(context: WorkflowContext, /):
     pass
 
@@ -121,9 +197,11 @@ def invalid_c(context: WorkflowContext, other_context: WorkflowContext):
     ),
 )
 def test_extract_inputs__where_args_are_invalid(func, expected):
-    with pytest.raises(WorkflowSetupError, match=expected):
+    with pytest.raises(WorkflowSetupError) as ex:
         functions.extract_inputs(func)
 
+    assert expected in str(ex.value)
+
 
 @pytest.mark.parametrize(
     "func, names",
@@ -135,11 +213,11 @@ def test_extract_inputs__where_args_are_invalid(func, expected):
     ),
 )
 def test_extract_outputs__where_args_are_invalid(func, names):
-    with pytest.raises(
-        WorkflowSetupError, match="Name count does not match type count."
-    ):
+    with pytest.raises(WorkflowSetupError) as ex:
         functions.extract_outputs(func, names)
 
+    assert "Name count does not match type count." in str(ex.value)
+
 
 def test_merge_nested_entries():
     data = [[1, 2, [3]], [4, 5, [6, 7]]]
@@ -147,3 +225,54 @@ def test_merge_nested_entries():
     actual = functions.merge_nested_entries(data, ["append", "append", "extend"])
 
     assert actual == ([1, 4], [2, 5], [3, 6, 7])
+
+
+def load_a() -> str:
+    return "a"
+
+
+def load_b() -> str:
+    return "b"
+
+
+def combine(load_a: str, load_b: str) -> str:
+    return load_a + load_b
+
+
+def use_context(context: WorkflowContext):
+    pass
+
+
+def test_dependency_levels():
+    steps = (
+        nodes.Step(load_a, output="load_a"),
+        nodes.Step(load_b, output="load_b"),
+        nodes.Step(combine, output="combined"),
+    )
+
+    actual = functions.dependency_levels(steps)
+
+    assert actual == [(steps[0], steps[1]), (steps[2],)]
+
+
+def test_dependency_levels__where_step_overwrites_a_read_variable():
+    steps = (
+        nodes.Step(combine, output="combined"),
+        nodes.Step(load_a, output="load_a"),
+    )
+
+    actual = functions.dependency_levels(steps)
+
+    assert actual == [(steps[0],), (steps[1],)]
+
+
+def test_dependency_levels__where_step_uses_context():
+    steps = (
+        nodes.Step(load_a, output="load_a"),
+        nodes.Step(use_context),
+        nodes.Step(load_b, output="load_b"),
+    )
+
+    actual = functions.dependency_levels(steps)
+
+    assert actual == [(steps[0],), (steps[1],), (steps[2],)]
@@ -1,12 +1,19 @@
 import logging
+import pickle
+import time
 from typing import Tuple, List
-from unittest.mock import ANY
+from unittest.mock import ANY, Mock
 
 import pytest
 from pyapp import feature_flags
 
 from pyapp_flow import nodes, WorkflowContext, skip_step
-from pyapp_flow.errors import FatalError, WorkflowRuntimeError, StepFailedError
+from pyapp_flow.errors import (
+    FatalError,
+    WorkflowRuntimeError,
+    WorkflowSetupError,
+    StepFailedError,
+)
 from pyapp_flow.testing import call_node
 
 
@@ -18,6 +25,10 @@ def valid_step_b(var_a: str, var_b: int = 42, *, ctx: WorkflowContext) -> str:
     return f"{var_a}:{var_b}"
 
 
+def valid_step_c(var_a: str, var_b: int = 42) -> str:
+    return f"{var_a}:{var_b}"
+
+
 def valid_multiple_returns(var_a: str) -> Tuple[str, str]:
     return var_a, var_a
 
@@ -38,11 +49,41 @@ def valid_log_warning(ctx: WorkflowContext):
     ctx.warning("Castaway")
 
 
+def append_char(char, var_b):
+    var_b.append(char)
+
+
+def append_key_b(key_a, key_b, var_b):
+    var_b.append(key_b)
+
+
+def add_char(char, var_b):
+    var_b.add(char)
+
+
+def add_key_b(key_a, key_b, var_b):
+    var_b.add(key_b)
+
+
+def pause():
+    time.sleep(0.001)
+
+
+def always_true(ctx):
+    return True
+
+
+def always_false(ctx):
+    return False
+
+
+STEP_A_TO_VAR_C = nodes.Step(valid_step_a, output="var_c")
+STEP_A_TO_VAR_D = nodes.Step(valid_step_a, output="var_d")
+
+
 class TestStep:
     def test_init__generates_correct_name(self):
-        actual = nodes.Step(valid_step_a, output="arg_t")
-
-        assert str(actual) == "Valid Step A"
+        assert str(STEP_A_TO_VAR_C) == "Valid Step A"
 
     def test_init__uses_assigned_name(self):
         actual = nodes.Step(valid_step_a, name="Custom name", output="arg_t")
@@ -55,53 +96,134 @@ class TestStep:
         assert actual.inputs == {"var_a": str, "var_b": int}
         assert actual.context_var == "ctx"
 
+    def test_init__accepts_callable_object(self):
+        actual = nodes.Step(TrackStep(("a",)))
+
+        assert str(actual) == "Trackstep"
+        assert actual.inputs == {"track": List[str], "var_a": str}
+
+    def test_pickle__where_step_has_a_single_input(self):
+        target = nodes.Step(valid_multiple_returns, output=("var_b", "var_c"))
+
+        actual = pickle.loads(pickle.dumps(target))
+
+        context = call_node(actual, var_a="foo")
+        assert context.state.var_b == context.state.var_c == "foo"
+
+    def test_pickle__where_step_is_cached(self):
+        target = nodes.Step(
+            valid_multiple_returns, output=("var_b", "var_c"), cache=True
+        )
+        target(WorkflowContext(var_a="foo"))
+
+        actual = pickle.loads(pickle.dumps(target))
+
+        assert actual._cache.cache_info().currsize == 0
+        context = call_node(actual, var_a="bar")
+        assert context.state.var_b == "bar"
+        assert actual._cache.cache_info().currsize == 1
+
     def test_init__accepts_lambda(self):
         actual = nodes.Step(lambda var_a: f"{var_a}!", name="foo")
 
         assert actual.inputs == {"var_a": None}
 
+    def test_init__cache_where_step_uses_context(self):
+        with pytest.raises(WorkflowSetupError):
+            nodes.Step(valid_step_b, output="arg_t", cache=True)
+
+    @pytest.mark.parametrize(
+        "var_a, expected_calls",
+        (
+            (2, 1),
+            ([2], 2),  # Unhashable values are not cached
+        ),
+    )
+    def test_call__cache(self, var_a, expected_calls):
+        func = Mock(return_value=42)
+        target = nodes.Step(lambda var_a: func(var_a), name="foo", cache=True)
+
+        for _ in range(2):
+            actual = target(WorkflowContext(var_a=var_a))
+
+        assert actual == 42
+        assert func.call_count == expected_calls
+
+    def test_call__cache_is_typed(self):
+        target = nodes.Step(lambda var_a: type(var_a), name="foo", cache=True)
+
+        actual = [target(WorkflowContext(var_a=value)) for value in (1, 1.0, True)]
+
+        assert actual == [int, float, bool]
+
+    def test_call__cache_is_bounded(self, monkeypatch):
+        monkeypatch.setattr(nodes, "STEP_CACHE_SIZE", 2)
+        func = Mock(side_effect=lambda var_a: var_a)
+        target = nodes.Step(lambda var_a: func(var_a), name="foo", cache=True)
+
+        for value in (1, 2, 3, 1):
+            target(WorkflowContext(var_a=value))
+
+        assert func.call_count == 4
+
     def test_call__all_vars_defined(self):
         context = WorkflowContext(var_a="foo", var_b=13)
-        target = nodes.Step(valid_step_a, output="var_c")
+        target = STEP_A_TO_VAR_C
 
         actual = target(context)
 
         assert actual == "foo:13"
         assert context.state["var_c"] == actual
 
-    def test_call__ignore_error(self):
-        context = WorkflowContext()
+    @pytest.mark.parametrize(
+        "context_vars, expected",
+        (
+            ({"var_a": "foo", "var_b": 13}, "foo:13"),
+            ({"var_a": "foo"}, "foo:42"),
+        ),
+    )
+    def test_call__positional_inputs(self, context_vars, expected):
+        context = WorkflowContext(**context_vars)
+        target = nodes.Step(valid_step_c, output="var_c")
+
+        actual = target(context)
+
+        assert actual == expected
+        assert context.state["var_c"] == expected
+
+    def test_call__ignore_error(self, empty_context):
         target = nodes.Step(valid_raise_exception, ignore_exceptions=KeyError)
 
-        target(context)
+        target(empty_context)
+
+    def test_call__ignore_error_from_list(self, empty_context):
+        target = nodes.Step(
+            valid_raise_exception, ignore_exceptions=[TypeError, KeyError]
+        )
+
+        target(empty_context)
 
-    def test_call__unhandled_error(self):
-        context = WorkflowContext()
+    def test_call__unhandled_error(self, empty_context):
         target = nodes.Step(valid_raise_exception, ignore_exceptions=TypeError)
 
         with pytest.raises(KeyError):
-            target(context)
+            target(empty_context)
 
-    def test_call__fatal_error(self):
-        context = WorkflowContext()
+    def test_call__fatal_error(self, empty_context):
         target = nodes.Step(valid_raise_fatal_exception, ignore_exceptions=TypeError)
 
         with pytest.raises(FatalError):
-            target(context)
+            target(empty_context)
 
-    def test_call__skipped(self):
-        context = WorkflowContext()
+    def test_call__skipped(self, empty_context):
         target = nodes.Step(valid_skip_step)
 
-        target(context)
+        target(empty_context)
 
 
 class TestGroup:
     def test_call(self):
-        target = nodes.Group(
-            nodes.Step(valid_step_a, output="var_c"),
-            nodes.Step(valid_step_a, output="var_d"),
-        )
+        target = nodes.Group(STEP_A_TO_VAR_C, STEP_A_TO_VAR_D)
 
         context = call_node(target, var_a="foo", var_b=13)
 
@@ -118,8 +240,7 @@ class TestGroup:
 
         assert len(caplog.records) == 0
 
-    def test_call__where_an_error_is_raised_with_always_nodes(self):
-        context = WorkflowContext()
+    def test_call__where_an_error_is_raised_with_always_nodes(self, empty_context):
         target = nodes.Group(
             nodes.Append("messages", "foo"),
             nodes.inline(valid_raise_exception),
@@ -129,9 +250,52 @@ class TestGroup:
         )
 
         with pytest.raises(KeyError):
-            call_node(target, workflow_context=context)
+            call_node(target, workflow_context=empty_context)
+
+        assert empty_context.state.messages == ["foo", "bar"]
+
+
+def load_a() -> str:
+    return "a"
 
-        assert context.state.messages == ["foo", "bar"]
+
+def load_b() -> str:
+    return "b"
+
+
+def combine(load_a: str, load_b: str) -> str:
+    return load_a + load_b
+
+
+class TestStepGraph:
+    @pytest.fixture
+    def target(self):
+        return nodes.StepGraph(
+            nodes.Step(load_a, output="load_a"),
+            nodes.Step(load_b, output="load_b"),
+            nodes.Step(combine, output="combined"),
+        )
+
+    def test_call(self, target):
+        context = call_node(target)
+
+        assert context.state["combined"] == "ab"
+
+    def test_call__where_an_error_is_raised(self):
+        target = nodes.StepGraph(
+            nodes.Step(load_a, output="load_a"), valid_raise_exception, max_workers=2
+        )
+
+        with pytest.raises(KeyError):
+            call_node(target)
+
+    def test_str(self, target):
+        assert str(target) == "Step graph"
+
+    def test_branches(self, target):
+        actual = target.branches()
+
+        assert actual == {"": (ANY, ANY, ANY)}
 
 
 class TestAppend:
@@ -162,27 +326,25 @@ class TestAppend:
         assert str(target) == "Append 'bar' to messages"
 
 
+SET_VARS = nodes.SetVar(
+    var_b=42, var_c="bar", var_d=lambda ctx: ctx.state["var_a"] + "bar"
+)
+
+
 class TestSetVar:
     def test_call(self):
-        target = nodes.SetVar(
-            var_b=42, var_c="bar", var_d=lambda ctx: ctx.state["var_a"] + "bar"
-        )
+        context = call_node(SET_VARS, var_a="foo", var_b=13)
 
-        context = call_node(target, var_a="foo", var_b=13)
-
-        assert context.state == {
-            "__trace": [ANY],
+        assert isinstance(context.state["__trace"], list)
+        assert context.state.items() >= {
             "var_a": "foo",
             "var_b": 42,
             "var_c": "bar",
             "var_d": "foobar",
-        }
+        }.items()
 
     def test_str(self):
-        target = nodes.SetVar(var_b=42, var_c="bar")
-
-        assert str(target) == "Set value(s) for var_b, var_c"
-
+        assert str(SET_VARS) == "Set value(s) for var_b, var_c, var_d"
 
 
 class TestDefaultVar:
@@ -192,163 +354,239 @@ class TestDefaultVar:
             var_b=42, var_c="bar", var_d=lambda ctx: ctx.state["var_a"] + "bar"
         )
 
-    def test_call__with_value(self, target):
+    def test_call__with_callable_default(self, target):
         context = call_node(target, var_a="foo", var_b=13)
 
-        assert context.state == {
-            "__trace": [ANY],
-            "var_a": "foo",
-            "var_b": 13,
-            "var_c": "bar",
-            "var_d": "foobar",
-        }
+        expected = {"var_a": "foo", "var_b": 13, "var_c": "bar", "var_d": "foobar"}
+        assert expected.items() <= context.state.items()
 
     def test_call__with_value(self, target):
         context = call_node(target, var_d="eek")
 
-        assert context.state == {
-            "__trace": [ANY],
-            "var_b": 42,
-            "var_c": "bar",
-            "var_d": "eek",
-        }
+        expected = {"var_b": 42, "var_c": "bar", "var_d": "eek"}
+        assert expected.items() <= context.state.items()
 
     def test_str(self, target):
         assert str(target) == "Default value(s) for var_b, var_c, var_d"
 
 
+APPEND_CHAR_STEP = nodes.Step(append_char)
+APPEND_KEY_B_STEP = nodes.Step(append_key_b)
+
+
 class TestForEach:
     def test_call__each_item_is_called(self):
-        target = nodes.ForEach("char", in_var="var_a").loop(
-            nodes.Step(lambda char, var_b: var_b.append(char))
-        )
+        target = nodes.ForEach("char", in_var="var_a").loop(APPEND_CHAR_STEP)
 
         context = call_node(
             target,
-            var_a=["ab", "cd", "ef"],
+            var_a=("ab", "cd", "ef"),
             var_b=[],
         )
 
-        assert context.state.var_a == context.state.var_b
+        assert tuple(context.state.var_b) == ("ab", "cd", "ef")
 
     def test_call__in_var_is_missing(self):
-        target = nodes.ForEach("char", in_var="var_a").loop(
-            nodes.Step(lambda char, var_b: var_b.append(char))
-        )
+        target = nodes.ForEach("char", in_var="var_a").loop(APPEND_CHAR_STEP)
 
-        with pytest.raises(WorkflowRuntimeError, match="not found in context"):
+        with pytest.raises(WorkflowRuntimeError) as ex:
             call_node(target, var_b=[])
 
-    def test_call__in_var_is_not_iterable(self):
-        target = nodes.ForEach("char", in_var="var_a").loop(
-            nodes.Step(lambda char, var_b: var_b.append(char))
-        )
-        with pytest.raises(WorkflowRuntimeError, match="is not iterable"):
-            call_node(target, var_a=None, var_b=[])
+        assert "not found in context" in str(ex.value)
 
-    def test_call__in_var_is_multiple_parts(self):
-        target = nodes.ForEach(("key_a", "key_b"), in_var="var_a",).loop(
-            nodes.Step(lambda key_a, key_b, var_b: var_b.append(key_b)),
-        )
+    @pytest.mark.parametrize(
+        "target_vars, var_a, loop_step",
+        (
+            ("char", None, APPEND_CHAR_STEP),
+            (("key_a", "key_b"), (("a", 1), 2, ("c", 3)), APPEND_KEY_B_STEP),
+        ),
+    )
+    def test_call__in_var_is_not_iterable(self, target_vars, var_a, loop_step):
+        target = nodes.ForEach(target_vars, in_var="var_a").loop(loop_step)
+
+        with pytest.raises(WorkflowRuntimeError) as ex:
+            call_node(target, var_a=var_a, var_b=[])
 
-        context = call_node(target, var_a=[("a", 1), ("b", 2), ("c", 3)], var_b=[])
+        assert "is not iterable" in str(ex.value)
+
+    @pytest.mark.parametrize("target_vars", (("key_a", "key_b"), "key_a, key_b"))
+    def test_call__in_var_is_multiple_parts(self, target_vars):
+        target = nodes.ForEach(target_vars, in_var="var_a").loop(APPEND_KEY_B_STEP)
+
+        context = call_node(target, var_a=(("a", 1), ("b", 2), ("c", 3)), var_b=[])
 
         assert context.state.var_b == [1, 2, 3]
 
-    def test_call__in_var_is_multiple_string(self):
-        target = nodes.ForEach("key_a, key_b", in_var="var_a",).loop(
-            nodes.Step(lambda key_a, key_b, var_b: var_b.append(key_b)),
+    def test_call__in_parallel(self):
+        target = nodes.ForEach("char", in_var="var_a", parallel=True).loop(
+            nodes.Step(add_char)
         )
 
-        context = call_node(
-            target,
-            var_a=[("a", 1), ("b", 2), ("c", 3)],
-            var_b=[],
+        context = call_node(target, var_a=("ab", "cd", "ef"), var_b=set())
+
+        assert context.state.var_b == {"ab", "cd", "ef"}
+
+    def test_call__in_parallel_with_multiple_parts(self):
+        target = nodes.ForEach(
+            ("key_a", "key_b"), in_var="var_a", parallel=True, max_workers=2
+        ).loop(
+            nodes.Step(add_key_b),
         )
 
-        assert context.state.var_b == [1, 2, 3]
+        context = call_node(target, var_a=(("a", 1), ("b", 2), ("c", 3)), var_b=set())
+
+        assert context.state.var_b == {1, 2, 3}
 
-    def test_call__in_var_is_multiple_parts_not_iterable(self):
-        target = nodes.ForEach(("key_a", "key_b"), in_var="var_a",).loop(
-            nodes.Step(lambda key_a, key_b, var_b: var_b.append(key_b)),
+    def test_call__in_parallel_where_iteration_raises(self):
+        target = nodes.ForEach("char", in_var="var_a", parallel=True).loop(
+            nodes.Step(valid_raise_fatal_exception)
         )
 
-        with pytest.raises(WorkflowRuntimeError, match="is not iterable"):
-            call_node(target, var_a=[("a", 1), 2, ("c", 3)], var_b=[])
+        with pytest.raises(FatalError, match="Boom!"):
+            call_node(target, var_a=("a", "b"))
 
-    def test_str__single_value(self):
-        target = nodes.ForEach("char", in_var="var_a").loop(
-            nodes.Step(lambda char, var_b: var_b.append(char))
+    def test_call__in_parallel_where_iteration_raises_keeps_flow_trace(
+        self, empty_context
+    ):
+        target = nodes.ForEach("char", in_var="var_a", parallel=True).loop(
+            nodes.Step(valid_raise_fatal_exception)
         )
 
-        assert str(target) == "For `char` in `var_a`"
+        with pytest.raises(FatalError):
+            call_node(target, workflow_context=empty_context, var_a=("a",))
 
-    def test_str__multi_value(self):
-        target = nodes.ForEach(("key_a", "key_b"), in_var="var_a").loop(
-            nodes.Step(lambda char, var_b: var_b.append(char)),
+        flow_trace = empty_context.flow_trace
+        assert flow_trace is not None
+        assert flow_trace[-1]["char"] == "a"
+
+    def test_call__in_parallel_scope_is_not_shared(self):
+        target = nodes.ForEach("char", in_var="var_a", parallel=True).loop(
+            nodes.SetVar(var_c=lambda ctx: ctx.state.char)
         )
 
-        assert str(target) == "For (`key_a`, `key_b`) in `var_a`"
+        context = call_node(target, var_a=("a", "b"))
+
+        assert "var_c" not in context.state
+
+    @pytest.mark.parametrize(
+        "target_vars, expected",
+        (
+            ("char", "For `char` in `var_a`"),
+            (("key_a", "key_b"), "For (`key_a`, `key_b`) in `var_a`"),
+        ),
+    )
+    def test_str(self, target_vars, expected):
+        target = nodes.ForEach(target_vars, in_var="var_a").loop(APPEND_CHAR_STEP)
+
+        assert str(target) == expected
 
     def test_branches(self):
         target = nodes.ForEach(("key_a", "key_b"), in_var="var_a").loop(
-            nodes.Step(lambda char, var_b: var_b.append(char)),
+            APPEND_CHAR_STEP
         )
 
         actual = target.branches()
 
-        assert actual == {
-            "loop": (ANY,),
-        }
+        assert list(actual) == ["loop"]
+        assert len(actual["loop"]) == 1
+
+
+RAISE_EXCEPTION_STEP = nodes.Step(valid_raise_exception)
 
 
 class TestCaptureErrors:
-    def test_call__with_no_errors(self):
+    @pytest.mark.parametrize(
+        "node_list, try_all, expected",
+        (
+            ((nodes.LogMessage("foo"),), True, []),
+            (
+                (
+                    nodes.LogMessage("foo"),
+                    RAISE_EXCEPTION_STEP,
+                    RAISE_EXCEPTION_STEP,
+                ),
+                False,
+                ["'Boom!'"],
+            ),
+            (
+                (
+                    nodes.LogMessage("foo"),
+                    RAISE_EXCEPTION_STEP,
+                    RAISE_EXCEPTION_STEP,
+                ),
+                True,
+                ["'Boom!'", "'Boom!'"],
+            ),
+        ),
+    )
+    def test_call(self, node_list, try_all, expected):
         context = call_node(
-            nodes.CaptureErrors("errors").nodes(nodes.LogMessage("foo")),
+            nodes.CaptureErrors("errors", try_all=try_all).nodes(*node_list),
         )
 
-        assert context.state["errors"] == []
+        assert list(map(str, context.state["errors"])) == expected
 
-    def test_call__fail_on_first_error(self):
+    @pytest.mark.parametrize(
+        "except_types", (KeyError, (KeyError,), [TypeError, KeyError])
+    )
+    def test_call__match_specified_exception(self, except_types):
         context = call_node(
-            nodes.CaptureErrors("errors", try_all=False).nodes(
-                nodes.LogMessage("foo"),
-                nodes.Step(valid_raise_exception),
-                nodes.Step(valid_raise_exception),
+            nodes.CaptureErrors("errors", except_types=except_types).nodes(
+                RAISE_EXCEPTION_STEP,
             )
         )
 
-        assert [str(e) for e in context.state["errors"]] == ["'Boom!'"]
+        assert list(map(str, context.state.errors)) == ["'Boom!'"]
+
+    def test_call__not_match_specified_exception(self):
+        with pytest.raises(KeyError):
+            call_node(
+                nodes.CaptureErrors("errors", except_types=(ValueError,)).nodes(
+                    RAISE_EXCEPTION_STEP,
+                )
+            )
 
-    def test_call__continue_after_error(self):
+    def test_call__parallel(self):
         context = call_node(
-            nodes.CaptureErrors("errors").nodes(
+            nodes.CaptureErrors("errors", parallel=True, max_workers=2).nodes(
                 nodes.LogMessage("foo"),
-                nodes.Step(valid_raise_exception),
-                nodes.Step(valid_raise_exception),
+                RAISE_EXCEPTION_STEP,
+                nodes.Step(valid_raise_fatal_exception),
             ),
         )
 
-        assert [str(e) for e in context.state["errors"]] == ["'Boom!'", "'Boom!'"]
+        assert [type(e) for e in context.state["errors"]] == [KeyError, FatalError]
 
-    def test_call__match_specified_exception(self):
+    def test_call__parallel_where_nodes_push_scopes(self):
         context = call_node(
-            nodes.CaptureErrors("errors", except_types=KeyError).nodes(
-                nodes.Step(valid_raise_exception),
-            )
+            nodes.CaptureErrors("errors", parallel=True).nodes(
+                nodes.ForEach("char", in_var="var_a").loop(
+                    nodes.Step(pause), nodes.Step(add_char)
+                ),
+                nodes.ForEach("key_a, key_b", in_var="var_c").loop(
+                    nodes.Step(pause), nodes.Step(add_key_b)
+                ),
+            ),
+            var_a=tuple("abcdefgh"),
+            var_c=tuple(enumerate(range(8))),
+            var_b=set(),
         )
 
-        assert [str(e) for e in context.state.errors] == ["'Boom!'"]
+        assert context.state.errors == []
+        assert context.state.var_b == set("abcdefgh") | set(range(8))
 
-    def test_call__not_match_specified_exception(self):
+    def test_call__parallel_not_match_specified_exception(self):
         with pytest.raises(KeyError):
             call_node(
-                nodes.CaptureErrors("errors", except_types=(ValueError,)).nodes(
-                    nodes.Step(valid_raise_exception),
-                )
+                nodes.CaptureErrors(
+                    "errors", except_types=ValueError, parallel=True
+                ).nodes(RAISE_EXCEPTION_STEP)
             )
 
+    def test_init__parallel_without_try_all(self):
+        with pytest.raises(WorkflowSetupError):
+            nodes.CaptureErrors("errors", try_all=False, parallel=True)
+
     def test_str(self):
         target = nodes.CaptureErrors("errors").nodes(nodes.LogMessage("foo"))
 
@@ -357,67 +595,59 @@ class TestCaptureErrors:
     def test_branches(self):
         target = nodes.CaptureErrors("errors", try_all=False).nodes(
             nodes.LogMessage("foo"),
-            nodes.Step(valid_raise_exception),
-            nodes.Step(valid_raise_exception),
+            RAISE_EXCEPTION_STEP,
+            RAISE_EXCEPTION_STEP,
         )
 
         actual = target.branches()
 
-        assert actual == {"": (ANY, ANY, ANY)}
-
-
-class TestConditional:
-    def test_call__true_branch_with_named_variable(self):
-        target = (
-            nodes.Conditional("var")
-            .true(nodes.Append("message", "True"))
-            .false(nodes.Append("message", "False"))
-        )
-        context = call_node(target, var=True)
-
-        assert context.state["message"] == ["True"]
+        assert list(actual) == [""]
+        assert len(actual[""]) == 3
 
-    def test_call__false_branch_with_named_variable(self):
-        target = (
-            nodes.Conditional("var")
-            .true(nodes.Append("message", "True"))
-            .false(nodes.Append("message", "False"))
-        )
 
-        context = call_node(target, var=False)
+APPEND_TRUE = nodes.Append("message", "True")
+APPEND_FALSE = nodes.Append("message", "False")
+APPEND_FOO1 = nodes.Append("message", "foo1")
+APPEND_FOO2 = nodes.Append("message", "foo2")
+APPEND_BAR1 = nodes.Append("message", "bar1")
+APPEND_BAR2 = nodes.Append("message", "bar2")
 
-        assert context.state["message"] == ["False"]
 
-    def test_call__true_branch_with_callable(self):
+class TestConditional:
+    @pytest.mark.parametrize(
+        "condition, context_vars, expected",
+        (
+            ("var", {"var": True}, ["True"]),
+            ("var", {"var": False}, ["False"]),
+            (always_true, {}, ["True"]),
+            (always_false, {}, ["False"]),
+        ),
+    )
+    def test_call(self, condition, context_vars, expected):
         target = (
-            nodes.Conditional(lambda ctx: True)
-            .true(nodes.Append("message", "True"))
-            .false(nodes.Append("message", "False"))
+            nodes.Conditional(condition)
+            .true(APPEND_TRUE)
+            .false(APPEND_FALSE)
         )
 
-        context = call_node(target)
+        context = call_node(target, **context_vars)
 
-        assert context.state["message"] == ["True"]
+        assert context.state["message"] == expected
 
-    def test_call__false_branch_with_callable(self):
-        target = (
-            nodes.Conditional(lambda ctx: False)
-            .true(nodes.Append("message", "True"))
-            .false(nodes.Append("message", "False"))
-        )
+    def test_call__branch_no_nodes(self):
+        target = nodes.Conditional(always_false).true(APPEND_TRUE)
 
         context = call_node(target)
 
-        assert context.state["message"] == ["False"]
+        assert "message" not in context.state
 
-    def test_call__branch_no_nodes(self):
-        target = nodes.Conditional(lambda ctx: False).true(
-            nodes.Append("message", "True")
-        )
+    def test_call__where_there_are_no_branches(self):
+        condition = Mock()
+        target = nodes.Conditional(condition)
 
-        context = call_node(target)
+        call_node(target)
 
-        assert "message" not in context.state
+        condition.assert_not_called()
 
     def test_call__invalid_conditional(self):
         with pytest.raises(TypeError):
@@ -430,9 +660,9 @@ class TestConditional:
 
     def test_branches(self):
         target = (
-            nodes.Conditional(lambda ctx: False)
-            .true(nodes.Append("message", "True"))
-            .false(nodes.Append("message", "False"))
+            nodes.Conditional(always_false)
+            .true(APPEND_TRUE)
+            .false(APPEND_FALSE)
         )
 
         actual = target.branches()
@@ -446,7 +676,7 @@ class TestConditional:
 class TestFeatureEnabled:
     @pytest.fixture
     def target(self):
-        return nodes.FeatureEnabled("MY-FEATURE").true(nodes.Append("message", "True")).false(nodes.Append("message", "False"))
+        return nodes.FeatureEnabled("MY-FEATURE").true(APPEND_TRUE).false(APPEND_FALSE)
 
     @pytest.fixture
     def enable_feature(self):
@@ -454,6 +684,7 @@ class TestFeatureEnabled:
         feature_flags.DEFAULT.set("MY-FEATURE", True)
         yield
         feature_flags.DEFAULT.set("MY-FEATURE", state)
+
     @pytest.fixture
     def disable_feature(self):
         state = feature_flags.get("MY-FEATURE")
@@ -477,26 +708,36 @@ class TestFeatureEnabled:
         assert context.state.message == ["False"]
 
 
+def _build_switch():
+    return (
+        nodes.Switch("who")
+        .case("foo", APPEND_FOO1, APPEND_FOO2)
+        .case("bar", APPEND_BAR1, APPEND_BAR2)
+    )
+
+
+@pytest.fixture(scope="module")
+def switch_node():
+    """Shared switch; tests must not modify it."""
+    return _build_switch()
+
+
 class TestSwitch:
     @pytest.fixture
-    def target(self):
-        return (
-            nodes.Switch("who")
-            .case(
-                "foo", nodes.Append("message", "foo1"), nodes.Append("message", "foo2")
-            )
-            .case(
-                "bar", nodes.Append("message", "bar1"), nodes.Append("message", "bar2")
-            )
-        )
+    def target(self, switch_node):
+        return switch_node
+
+    @pytest.fixture
+    def mutable_target(self):
+        return _build_switch()
 
     def test_call__matching_branch(self, target):
         context = call_node(target, who="foo")
 
         assert context.state["message"] == ["foo1", "foo2"]
 
-    def test_call__using_default(self, target):
-        target.default(nodes.Append("message", "default"))
+    def test_call__using_default(self, mutable_target):
+        target = mutable_target.default(nodes.Append("message", "default"))
 
         context = call_node(target, who="eek")
 
@@ -508,9 +749,7 @@ class TestSwitch:
         assert "message" not in context.state
 
     def test_call__with_lambda_condition(self):
-        target = nodes.Switch(lambda ctx: ctx.state["who"]).case(
-            "foo", nodes.Append("message", "foo1")
-        )
+        target = nodes.Switch(lambda ctx: ctx.state["who"]).case("foo", APPEND_FOO1)
 
         context = call_node(target, who="foo")
 
@@ -531,8 +770,8 @@ class TestSwitch:
             "foo": (ANY, ANY),
         }
 
-    def test_branches__with_default(self, target):
-        target.default(nodes.LogMessage("default called"))
+    def test_branches__with_default(self, mutable_target):
+        target = mutable_target.default(nodes.LogMessage("default called"))
 
         actual = target.branches()
 
@@ -544,28 +783,37 @@ class TestSwitch:
 
 
 class TestLogMessage:
-    def test_call__with_default_level(self, caplog):
-        target = nodes.LogMessage("Foo{who}")
+    @pytest.mark.parametrize(
+        "kwargs, level",
+        (
+            ({}, logging.INFO),  # Default level
+            ({"level": logging.ERROR}, logging.ERROR),
+        ),
+    )
+    def test_call__with_level(self, caplog, kwargs, level):
+        target = nodes.LogMessage("Foo{who}", **kwargs)
 
-        with caplog.at_level(logging.INFO):
+        with caplog.at_level(level):
             call_node(target, who="bar")
 
         assert caplog.messages == ["  Foobar"]
+        assert [record.levelno for record in caplog.records] == [level]
 
-    def test_call__with_error_level(self, caplog):
-        target = nodes.LogMessage("Foo{who}", level=logging.ERROR)
+    def test_call__where_level_is_disabled(self, caplog, empty_context):
+        target = nodes.LogMessage("Foo{who}", level=logging.DEBUG)
 
-        with caplog.at_level(logging.ERROR):
-            call_node(target, who="bar")
+        with caplog.at_level(logging.INFO):
+            target(empty_context)
 
-        assert caplog.messages == ["  Foobar"]
+        # Message is not formatted, so no warning about the missing variable
+        assert caplog.messages == []
 
     def test_call__at_greater_depth(self, caplog):
         context = WorkflowContext(who="oobar")
         target = nodes.LogMessage("Foo{who}")
 
         with caplog.at_level(logging.INFO):
-            with context:
+            with context.block_indent():
                 target(context)
 
         assert caplog.messages == ["    Foooobar"]
@@ -590,13 +838,22 @@ class TestLogMessage:
         assert target.message == "Foo{who}"
 
 
-def track_step(*match_values: str) -> nodes.Step:
-    def _step(track: List[str], var_a: str):
-        track.append(match_values[0])
-        if var_a not in match_values:
+class TrackStep:
+    """Step function that tracks calls and fails unless var_a matches."""
+
+    __slots__ = ("match_values",)
+
+    def __init__(self, match_values: Tuple[str, ...]):
+        self.match_values = match_values
+
+    def __call__(self, track: List[str], var_a: str):
+        track.append(self.match_values[0])
+        if var_a not in self.match_values:
             raise StepFailedError()
 
-    return nodes.Step(_step, name="tracking_step")
+
+def track_step(*match_values: str) -> nodes.Step:
+    return nodes.Step(TrackStep(match_values), name="tracking_step")
 
 
 class TestTryExcept:
@@ -666,6 +923,13 @@ class TestTryUntil:
 
         assert context.state.track == ["a", "b", "c", "default"]
 
+    def test_call__where_except_types_is_a_list(self, target):
+        target.except_types = [ValueError, StepFailedError]
+
+        context = call_node(target, track=[], var_a="z")
+
+        assert context.state.track == ["a", "b", "c", "default"]
+
     def test_call__where_other_exception(self, target):
         target.except_types = (ValueError,)
 
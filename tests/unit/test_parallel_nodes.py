@@ -1,65 +1,446 @@
-from unittest.mock import patch, Mock
+import importlib
+from functools import partial
+from unittest.mock import Mock
 
 import pytest
 
 from pyapp_flow import parallel_nodes, WorkflowContext
-from pyapp_flow.errors import FatalError
+from pyapp_flow.errors import FatalError, WorkflowRuntimeError
 
 
-@patch("importlib.import_module")
-def test_import_node(mock_import_module):
-    mock_node_test = Mock()
-    mock_import_module.return_value = Mock(NodeTest=mock_node_test)
+_NODE_TEST_MOCK = Mock(return_value=[])
+_IMPORT_MODULE_MOCK = Mock(return_value=Mock(NodeTest=_NODE_TEST_MOCK))
+
+
+@pytest.fixture(autouse=True)
+def worker_globals(monkeypatch):
+    """Restore the worker globals set by _worker_init after each test."""
+    monkeypatch.setattr(parallel_nodes, "_worker_node", None)
+    monkeypatch.setattr(parallel_nodes, "_worker_import_error", None)
+    monkeypatch.setattr(parallel_nodes, "_worker_shared_data", (None, {}))
+
+
+@pytest.fixture
+def mock_import_module(monkeypatch):
+    """Replace import_module with a mock returning a module with a NodeTest node."""
+    _IMPORT_MODULE_MOCK.reset_mock(side_effect=True)
+    _NODE_TEST_MOCK.reset_mock()
+    monkeypatch.setattr(importlib, "import_module", _IMPORT_MODULE_MOCK)
+    return _IMPORT_MODULE_MOCK
 
+
+def test_import_node(mock_import_module):
     actual = parallel_nodes.import_node("this.is.a.test:NodeTest")
 
-    assert actual is mock_node_test
+    assert actual is mock_import_module.return_value.NodeTest
     mock_import_module.assert_called_once_with("this.is.a.test")
 
 
-@patch("importlib.import_module")
-def test_call_parallel_node(mock_import_module):
-    mock_node_test = Mock(return_value=[])
-    mock_import_module.return_value = Mock(NodeTest=mock_node_test)
+def _append_ook(context: WorkflowContext):
+    context.state.foo += "-ook"
+
+
+def _append_suffix(context: WorkflowContext):
+    context.state.foo += context.state.suffix
 
-    actual = parallel_nodes._call_parallel_node(
-        "this.is.a.test:NodeTest",
-        {"foo": "bar"},
-        ["foo"],
+
+def _split_chars(context: WorkflowContext):
+    context.state.chars = list(context.state.foo)
+
+
+def _count_calls(context: WorkflowContext):
+    context.state.calls = context.state.get("calls", 0) + 1
+
+
+def test_call_parallel_batch(mock_import_module):
+    parallel_nodes._worker_init("this.is.a.test:NodeTest")
+
+    actual = parallel_nodes._call_parallel_batch(
+        ["bar", "eek"], "foo", ["foo"], ["append"]
     )
 
-    assert actual == ("bar",)
+    assert actual == (["bar", "eek"],)
+    mock_import_module.assert_called_once_with("this.is.a.test")
 
 
-@patch("importlib.import_module")
-def test_call_parallel_node__import_failure(mock_import_module):
+def test_call_parallel_batch__import_failure(mock_import_module):
     mock_import_module.side_effect = ImportError("Boom!")
+    parallel_nodes._worker_init("this.is.a.test:NodeTest")
 
     with pytest.raises(FatalError, match="Unable to import parallel node: Boom!"):
-        parallel_nodes._call_parallel_node(
-            "this.is.a.test:NodeTest",
-            {"foo": "bar"},
-            ["foo"],
+        parallel_nodes._call_parallel_batch(["bar"], "foo", ["foo"], ["append"])
+
+
+def test_call_parallel_batch__error_importing_node(mock_import_module):
+    mock_import_module.side_effect = ValueError("Boom!")
+    parallel_nodes._worker_init("this.is.a.test:NodeTest")
+
+    with pytest.raises(ValueError, match="Boom!"):
+        parallel_nodes._call_parallel_batch(["bar"], "foo", ["foo"], ["append"])
+
+
+def test_call_parallel_batch__where_node_is_pickled():
+    parallel_nodes._worker_init(parallel_nodes._dump_node(_append_ook))
+
+    actual = parallel_nodes._call_parallel_batch(["bar"], "foo", ["foo"], ["append"])
+
+    assert actual == (["bar-ook"],)
+
+
+def test_call_parallel_batch__where_state_is_scoped_to_each_value():
+    parallel_nodes._worker_init(parallel_nodes._dump_node(_count_calls))
+
+    actual = parallel_nodes._call_parallel_batch([1, 2, 3], "foo", ["calls"], ["append"])
+
+    assert actual == ([1, 1, 1],)
+
+
+def test_call_parallel_batch__where_values_are_shared():
+    parallel_nodes._worker_init(parallel_nodes._dump_node(_append_ook))
+    shm = parallel_nodes._share_data(["bar", "eek"])
+
+    try:
+        actual = parallel_nodes._call_parallel_batch(
+            shm.name, "foo", ["foo"], ["append"]
         )
+    finally:
+        parallel_nodes._release_shared_data(shm)
+
+    assert actual == (["bar-ook", "eek-ook"],)
+
+
+def test_share_data():
+    data = {"foo": "bar", "blob": bytearray(b"eek" * 1024)}
+    shm = parallel_nodes._share_data(data)
+
+    try:
+        actual = parallel_nodes._load_shared_data(shm.name)
+    finally:
+        shm.close()
+        shm.unlink()
+
+    assert actual == data
+
+
+def test_call_parallel_batch__with_shared_data(mock_import_module):
+    parallel_nodes._worker_init("this.is.a.test:NodeTest")
+    shm = parallel_nodes._share_data({"foo": "bar", "eek": "ook"})
+
+    try:
+        actual = parallel_nodes._call_parallel_batch(
+            ["baz"], "foo", ["foo", "eek"], ["append", "append"], shared=shm.name
+        )
+    finally:
+        shm.close()
+        shm.unlink()
+
+    assert actual == (["baz"], ["ook"])
+
+
+def test_call_parallel_batch__with_shared_data_dict(mock_import_module):
+    parallel_nodes._worker_init("this.is.a.test:NodeTest")
+
+    actual = parallel_nodes._call_parallel_batch(
+        ["baz"],
+        "foo",
+        ["foo", "eek"],
+        ["append", "append"],
+        shared={"foo": "bar", "eek": "ook"},
+    )
+
+    assert actual == (["baz"], ["ook"])
+
+
+def test_call_parallel_batch__where_values_are_extended(mock_import_module):
+    parallel_nodes._worker_init("this.is.a.test:NodeTest")
+
+    actual = parallel_nodes._call_parallel_batch(
+        [[1, 2], [3]], "foo", ["foo", "foo"], ["extend", "append"]
+    )
+
+    assert actual == ([1, 2, 3], [[1, 2], [3]])
+
+
+@pytest.mark.parametrize(
+    "values, batch_size, expected",
+    (
+        ([], 2, []),
+        ([1, 2, 3], 1, [[1], [2], [3]]),
+        ([1, 2, 3], 2, [[1, 2], [3]]),
+        ([1, 2, 3], 5, [[1, 2, 3]]),
+    ),
+)
+def test_batches(values, batch_size, expected):
+    actual = list(parallel_nodes._batches(values, batch_size))
+
+    assert actual == expected
+
+
+class InProcessPool:
+    """Pool that calls tasks in the current process."""
+
+    def __init__(self, initializer, initargs):
+        initializer(*initargs)
+
+    def imap(self, func, iterable):
+        return map(func, iterable)
+
+    def apply_async(self, func, args):
+        # Deferred until the result is requested, as a worker would be
+        return Mock(get=partial(func, *args))
+
+    def close(self):
+        pass
+
+    def join(self):
+        pass
 
 
 class TestMapNodes:
     @pytest.fixture
-    def target(self):
-        target = parallel_nodes.MapNode("message", in_var="messages")
-        target.pool_type = Mock(
-            starmap=Mock(
-                lambda node_id, context_data, return_vars: (
-                    node_id,
-                    context_data,
-                    return_vars,
-                )
+    def pool_type(self, monkeypatch):
+        pool_type = Mock()
+        monkeypatch.setattr(parallel_nodes.MapNode, "pool_type", pool_type)
+        return pool_type
+
+    @pytest.fixture
+    def in_process_pool(self, monkeypatch):
+        monkeypatch.setattr(parallel_nodes.MapNode, "pool_type", InProcessPool)
+
+    @pytest.fixture
+    def released_blocks(self, monkeypatch):
+        """Record shared memory blocks as they are released."""
+        released = []
+        release = parallel_nodes._release_shared_data
+
+        def _release_shared_data(shm):
+            released.append(shm.name)
+            release(shm)
+
+        monkeypatch.setattr(
+            parallel_nodes, "_release_shared_data", _release_shared_data
+        )
+        return released
+
+    @pytest.fixture
+    def target(self, pool_type):
+        return parallel_nodes.MapNode("message", in_var="messages")
+
+    @pytest.mark.skipif(
+        parallel_nodes.SharedMemory is None, reason="Shared memory not supported"
+    )
+    def test_map_shared_batches__where_blocks_are_created_lazily(self, monkeypatch):
+        live_blocks, peak = set(), [0]
+        share_data = parallel_nodes._share_data
+        release_shared_data = parallel_nodes._release_shared_data
+
+        def _share_data(data):
+            shm = share_data(data)
+            live_blocks.add(shm.name)
+            peak[0] = max(peak[0], len(live_blocks))
+            return shm
+
+        def _release_shared_data(shm):
+            live_blocks.discard(shm.name)
+            release_shared_data(shm)
+
+        monkeypatch.setattr(parallel_nodes, "_share_data", _share_data)
+        monkeypatch.setattr(
+            parallel_nodes, "_release_shared_data", _release_shared_data
+        )
+        pool = InProcessPool(initializer=lambda: None, initargs=())
+        batches = iter([[1], [2], [3], [4], [5]])
+
+        actual = list(
+            parallel_nodes.MapNode._map_shared_batches(
+                pool, parallel_nodes._load_shared_data, batches, window=2
             )
         )
-        # target.loop()
-        return target
 
-    def test_call(self, target):
+        assert actual == [[1], [2], [3], [4], [5]]
+        assert peak[0] == 2
+        assert live_blocks == set()
+
+    def test_call__where_there_is_no_loop_node(self, target, pool_type):
         context = WorkflowContext(messages=["foo", "bar", "baz"])
 
         target(context)
+
+        pool_type.assert_not_called()
+
+    @pytest.mark.parametrize("batch_size", (None, 1, 2, 5))
+    def test_call__with_process_backend(self, in_process_pool, batch_size):
+        target = (
+            parallel_nodes.MapNode("foo", in_var="values")
+            .loop(_append_ook)
+            .merge_vars("foo")
+        )
+        if batch_size:
+            target.batch(batch_size)
+        context = WorkflowContext(values=["a", "b", "c"])
+
+        target(context)
+
+        assert context.state.foo == ["a-ook", "b-ook", "c-ook"]
+
+    def test_call__with_process_backend_and_extend_merge(self, in_process_pool):
+        target = (
+            parallel_nodes.MapNode("foo", in_var="values")
+            .loop(_split_chars)
+            .merge_vars(("chars", parallel_nodes.MergeMethod.Extend))
+            .batch(2)
+        )
+        context = WorkflowContext(values=["ab", "cd", "e"])
+
+        target(context)
+
+        assert context.state.chars == ["a", "b", "c", "d", "e"]
+
+    @pytest.mark.skipif(
+        parallel_nodes.SharedMemory is None, reason="Shared memory not supported"
+    )
+    def test_call__with_process_backend_and_shared_memory(
+        self, in_process_pool, released_blocks
+    ):
+        target = (
+            parallel_nodes.MapNode("foo", in_var="values")
+            .loop(_append_suffix)
+            .merge_vars("foo")
+            .shared_vars("suffix")
+            .share_values()
+            .batch(2)
+        )
+        context = WorkflowContext(values=["a", "b", "c"], suffix="-eek")
+
+        target(context)
+
+        assert context.state.foo == ["a-eek", "b-eek", "c-eek"]
+        # Shared vars block and a block for each of the two batches
+        assert len(set(released_blocks)) == 3
+
+    def test_call__shared_var_is_missing(self, target):
+        target.shared_vars("lookup")
+        context = WorkflowContext(messages=["foo", "bar", "baz"])
+
+        with pytest.raises(WorkflowRuntimeError, match="lookup not found in context"):
+            target(context)
+
+    def test_pool__is_created_once_per_node(self, target, pool_type):
+        actual_a = target._pool("this.is.a.test:NodeTest")
+        actual_b = target._pool("this.is.a.test:NodeTest")
+
+        assert actual_a is actual_b
+        pool_type.assert_called_once_with(
+            initializer=parallel_nodes._worker_init,
+            initargs=("this.is.a.test:NodeTest",),
+        )
+
+    def test_loop__where_node_is_an_id(self, target):
+        target.loop("this.is.a.test:NodeTest")
+
+        assert target._node_ref == "this.is.a.test:NodeTest"
+        assert target.branches() == {"loop": ["this.is.a.test:NodeTest"]}
+
+    def test_loop__where_node_is_a_lambda(self, target):
+        node = lambda context: None  # noqa: E731
+
+        target.loop(node)
+
+        assert isinstance(target._process_node_ref(), bytes)
+        assert target.branches() == {"loop": [node]}
+
+    def test_loop__where_node_is_not_pickled_until_used(self, target, monkeypatch):
+        monkeypatch.setattr(parallel_nodes, "cloudpickle", None)
+
+        target.loop(lambda context: None)
+
+        assert target._node_ref is None
+
+    def test_init__where_backend_is_unknown(self):
+        with pytest.raises(ValueError):
+            parallel_nodes.MapNode("message", in_var="messages", backend="fibre")
+
+    def test_call__with_thread_backend(self):
+        target = (
+            parallel_nodes.MapNode("foo", in_var="values", backend="thread")
+            .loop(_append_ook)
+            .merge_vars("foo")
+        )
+        context = WorkflowContext(values=["a", "b", "c"])
+
+        target(context)
+
+        assert context.state.foo == ["a-ook", "b-ook", "c-ook"]
+
+    def test_call__with_thread_backend_where_node_is_a_closure(self, monkeypatch):
+        monkeypatch.setattr(parallel_nodes, "cloudpickle", None)
+        suffix = "-eek"
+
+        def append_eek(context: WorkflowContext):
+            context.state.foo += suffix
+
+        target = (
+            parallel_nodes.MapNode("foo", in_var="values", backend="thread")
+            .loop(append_eek)
+            .merge_vars("foo")
+        )
+        context = WorkflowContext(values=["a", "b"])
+
+        target(context)
+
+        assert context.state.foo == ["a-eek", "b-eek"]
+
+    def test_call__with_thread_backend_and_shared_var(self):
+        target = (
+            parallel_nodes.MapNode("message", in_var="messages", backend="thread")
+            .loop(_append_ook)
+            .merge_vars("foo")
+            .shared_vars("foo")
+        )
+        context = WorkflowContext(messages=[1, 2], foo="bar")
+
+        target(context)
+
+        assert context.state.foo == ["bar-ook", "bar-ook"]
+
+    def test_batch__where_batch_size_is_invalid(self, target):
+        with pytest.raises(ValueError, match="Batch size must be at least 1"):
+            target.batch(0)
+
+    def test_close(self, target):
+        pool = target._pool("this.is.a.test:NodeTest")
+
+        with target:
+            pass
+
+        pool.close.assert_called_once_with()
+        pool.join.assert_called_once_with()
+        assert target._pools == {}
+
+    def test_call__with_thread_backend_where_target_var_is_shared(self):
+        target = (
+            parallel_nodes.MapNode("foo", in_var="values", backend="thread")
+            .loop(_append_ook)
+            .merge_vars("foo")
+            .shared_vars("foo")
+        )
+        context = WorkflowContext(values=["a", "b"], foo="bar")
+
+        target(context)
+
+        assert context.state.foo == ["a-ook", "b-ook"]
+
+    @pytest.mark.parametrize(
+        "processes, values, expected",
+        (
+            (2, [1] * 100, 13),
+            (4, [1] * 100, 7),
+            (4, [1] * 16, 1),
+            (4, [1] * 3, 1),
+            (4, [], 1),
+        ),
+    )
+    def test_default_batch_size(self, target, processes, values, expected):
+        actual = target._default_batch_size(values, processes)
+
+        assert actual == expected
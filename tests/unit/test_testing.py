@@ -1,18 +1,21 @@
-from __future__ import annotations
+from typing import Optional
 
 from pyapp_flow import step, WorkflowContext
 from pyapp_flow import testing
 
 
+_ISBNS = {
+    "Hyperion": "978-0553283686",
+    "The Fall of Hyperion": "978-0553288209",
+}
+
+
 @step(output="isbn_13")
-def find_isbn(*, title: str) -> None | str:
+def find_isbn(*, title: str) -> Optional[str]:
     """
     Mock step that returns the ISBN of a known book
     """
-    return {
-        "Hyperion": "978-0553283686",
-        "The Fall of Hyperion": "978-0553288209",
-    }.get(title)
+    return _ISBNS.get(title)
 
 
 def test_call_step__where_value_is_returned():